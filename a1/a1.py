@@ -5,19 +5,23 @@ Semester 1, 2022
 CSSE1001/CSSE7030
 """
 
+import io
+import sys
+from contextlib import redirect_stdout
+from itertools import zip_longest
 from string import ascii_lowercase
-from typing import Optional
+from typing import Callable, Optional
 
-from a1_support import (
-    load_words,
-    choose_word,
-    VOCAB_FILE,
-    ANSWERS_FILE,
-    CORRECT,
-    MISPLACED,
-    INCORRECT,
-    UNSEEN,
-)
+from a1_support import CORRECT, MISPLACED, INCORRECT
+from answer_pool import AnswerPool
+from constraints import HardModeRules
+from dictionary import Dictionary, MIN_LENGTH, MAX_LENGTH, WORD_LENGTH
+from patterns import grade, decode_pattern
+from session import GameSession, Keyboard, MAX_GUESSES
+from vocabulary import Vocabulary
+# The hints, absurdle and multi-board modules need NumPy, so they're only
+# imported by the modes and commands that use them. A classic game without
+# hints runs without NumPy.
 
 
 # Replace these <strings> with your name, student number and email address.
@@ -27,6 +31,26 @@ __email__ = "lucas.hicks@uqconnect.edu.au"
 
 # Add your functions here
 
+# Game modes that main can be started in
+CLASSIC = 'classic'
+ABSURDLE = 'absurdle'
+# Board counts of the multi-board modes
+BOARD_COUNTS = {'dordle': 2, 'quordle': 4, 'octordle': 8}
+# Boards get this many guesses on top of one per board
+EXTRA_GUESSES = 5
+MODES = (CLASSIC, ABSURDLE) + tuple(BOARD_COUNTS)
+# Command line option for hard mode, e.g. python a1.py classic hard
+HARD = 'hard'
+# Command line options for the word length and guess limit, e.g.
+# python a1.py classic length=5 guesses=7
+LENGTH_OPTION = 'length='
+GUESSES_OPTION = 'guesses='
+# Most guesses a game can be given on the command line
+MAX_GUESS_LIMIT = 99
+# Boards printed next to each other before starting a new row of boards
+BOARDS_PER_ROW = 4
+BOARD_GAP = '    '
+
 
 def has_won(guess: str, answer: str) -> bool:
     """
@@ -47,19 +71,20 @@ def has_won(guess: str, answer: str) -> bool:
         return False
 
 
-def has_lost(guess_number: int) -> bool:
+def has_lost(guess_number: int, max_guesses: int = MAX_GUESSES) -> bool:
     """ Checks if the player has lost yet
 
     Returns true if the guess number is greater or
-    equal to the maximum number of guesses (6)
+    equal to the maximum number of guesses (6 by default)
 
     Parameters:
     guess_number (int): Number of guesses the user has had
+    max_guesses (int): Number of guesses allowed in the game
 
     Returns:
     bool: whether the user has lost or not
     """
-    if guess_number >= 6:
+    if guess_number >= max_guesses:
         return True
     else:
         return False
@@ -85,33 +110,50 @@ def remove_word(words: tuple[str, ...], word: str) -> tuple[str, ...]:
     return words[:position] + words[position+1:]
 
 
-def prompt_user(guess_number: int, words: tuple[str, ...]) -> str:
+def prompt_user(
+        guess_number: int, words: tuple[str, ...],
+        rules: Optional[HardModeRules] = None,
+        length: int = WORD_LENGTH,
+        read: Callable[[str], str] = input) -> str:
     """ Prompts user for a guess until it is valid.
 
     Prompts the user for a guess until there guess is valid.
     A guess must be either:
-    - exactly 6 letters long
+    - exactly length letters long (6 by default)
     - a word in the vocab.txt file
     - a h,k or q (help, keyboard, quit).
-    This function then returns a lowercase version of this guess/input
+    This function then returns a lowercase version of this guess/input.
+    When words is a Vocabulary, unknown words get "did you mean" suggestions.
+    In hard mode a guess must also reuse every letter revealed so far.
 
     Parameters:
     guess_number (int): The number of guesses the user has had
     words (tuple[str, ...]): List of valid words that a user can input
+    rules (HardModeRules): hard mode rules of the game, or None
+    length (int): number of letters in a guess
+    read (Callable[[str], str]): reads the user's input after a prompt
 
     Returns:
     str: lowercase version of the users guess/input
     """
     options = ('k', 'q', 'h')
     while True:
-        guess = input(f'Enter guess {guess_number}: ').lower()
+        guess = read(f'Enter guess {guess_number}: ').lower()
         # Checks if the user has chosen to q, ask for help, or check keyboard
         if guess in options:
             return guess
-        elif len(guess) != 6:
-            print('Invalid! Guess must be of length 6')
+        elif len(guess) != length:
+            print('Invalid! Guess must be of length ' + str(length))
         elif guess not in words:
             print('Invalid! Unknown word')
+            # Vocabulary indexes can suggest nearby words, plain tuples can't
+            if isinstance(words, Vocabulary):
+                suggestions = words.suggest(guess)
+                if suggestions:
+                    print('Did you mean: ' + ', '.join(suggestions) + '?')
+        elif rules is not None and (
+                reason := rules.violation(guess)) is not None:
+            print('Invalid! ' + reason)
         else:
             return guess
 
@@ -124,6 +166,8 @@ def process_guess(guess: str, answer: str) -> str:
     Green square - same letter has occurred in the same position as answer.
     Yellow square - same letter has occurred in a different position as answer.
     Black square - letter is not present in the answer
+    A repeated letter is only coloured as many times as it appears in the
+    answer, with green squares taking priority over yellow ones.
 
     Parameters:
     guess (str): a users guess (6 letters)
@@ -132,41 +176,7 @@ def process_guess(guess: str, answer: str) -> str:
     Returns:
     str: version of guess string with each letter being replaced with squares
     """
-    result = list(guess)
-    done = []
-    for char in guess:
-        if char not in done:
-            if guess.count(char) == 1:
-                # only one instance of the characeter
-                if char in answer:
-                    if guess.index(char) == answer.index(char):
-                        result[result.index(char)] = CORRECT
-                    else:
-                        result[result.index(char)] = MISPLACED
-                else:
-                    result[result.index(char)] = INCORRECT
-            else:
-                # Character occurs multiple times
-                position_list = []
-                for n in range(len(guess)):
-                    if guess[n] == char:
-                        position_list.append(n)
-                if answer.count(char) > 0:
-                    # Character appears in string
-                    answer_position = answer.index(char)
-                    if answer_position in position_list:
-                        result[answer_position] = CORRECT
-                        position_list.remove(answer_position)
-                    else:
-                        result[position_list[0]] = MISPLACED
-                        position_list.pop(0)
-                for char_position in position_list:
-                    result[char_position] = INCORRECT
-
-            done.append(char)
-
-    result = ''.join(x for x in result)
-    return result
+    return decode_pattern(grade(guess, answer), len(guess))
 
 
 def update_history(
@@ -186,10 +196,7 @@ def update_history(
     Returns:
     tuple[tuple[str,str],...]: A version of history with new word and squares
     """
-    # Converts to list to allow for changes as list are mutable
-    temp_tuple = list(history)
-    temp_tuple.append((guess, process_guess(guess, answer)))
-    return tuple(temp_tuple)
+    return history + ((guess, process_guess(guess, answer)),)
 
 
 def print_history(history: tuple[tuple[str, str], ...]) -> None:
@@ -225,57 +232,63 @@ def print_keyboard(history: tuple[tuple[str, str], ...]) -> None:
     Parameters:
     history (tuple[tuple[str,str],...]): Tuple with guess words and squares
     """
-    letters = {
-        'a': UNSEEN,
-        'b': UNSEEN,
-        'c': UNSEEN,
-        'd': UNSEEN,
-        'e': UNSEEN,
-        'f': UNSEEN,
-        'g': UNSEEN,
-        'h': UNSEEN,
-        'i': UNSEEN,
-        'j': UNSEEN,
-        'k': UNSEEN,
-        'l': UNSEEN,
-        'm': UNSEEN,
-        'n': UNSEEN,
-        'o': UNSEEN,
-        'p': UNSEEN,
-        'q': UNSEEN,
-        'r': UNSEEN,
-        's': UNSEEN,
-        't': UNSEEN,
-        'u': UNSEEN,
-        'v': UNSEEN,
-        'w': UNSEEN,
-        'x': UNSEEN,
-        'y': UNSEEN,
-        'z': UNSEEN,
-    }
-    # List used to 'rank' squares -> a lower index equals better square
-    # Green > Yellow > Black > Unseen  <--- Square ranking
-    options = [CORRECT, MISPLACED, INCORRECT, UNSEEN]
-    for guess_pair in history:
-        # Iterates through each character in each guess
-        for char_index in range(len(guess_pair[0])):
-            # If char in iteration is greater than dict
-            square = guess_pair[1][char_index]
-            char = guess_pair[0][char_index]
-            # Checks if square in letters is 'better' than square
-            if options.index(square) < options.index(letters[char]):
-                letters[char] = square
-    print('\nKeyboard information\n'+'-'*12)
-    counter = 0  # Counter used as logic for either printing a tab or new line
-    # Prints keyboard information in user friendly way
-    # Use of ternary operators for spacing
-    for key in letters:
-        # Determine if newline or tab space is required
-        endval = '\n' if counter % 2 else '' if counter == 25 else '\t'
-        print(key+': ' + letters[key], end=endval)
-        counter += 1
-    # Used to format output correctly
-    print('')
+    keyboard = Keyboard()
+    for guess, squares in history:
+        keyboard.update(guess, squares)
+    print(keyboard.format(), end='')
+
+
+def print_hint(guess: str, tier: str) -> None:
+    """ Prints a suggested guess and how thoroughly it was searched for
+
+    Parameters:
+    guess (str): the suggested guess
+    tier (str): name of the search tier the guess came from
+    """
+    print('Ah, you need help? Try: ' + guess + ' (' + tier + ' search)')
+
+
+def display_width(text: str) -> int:
+    """ Returns the number of terminal columns text takes up
+
+    Square characters are drawn two columns wide.
+
+    Parameters:
+    text (str): a single line of text
+
+    Returns:
+    int: the width of text in columns
+    """
+    squares = sum(text.count(square) for square in (
+        CORRECT, MISPLACED, INCORRECT))
+    return len(text) + squares
+
+
+def print_boards(histories: tuple[tuple[tuple[str, str], ...], ...]) -> None:
+    """ Prints the guess history of several boards side by side
+
+    Each board is drawn by print_history, and up to BOARDS_PER_ROW boards
+    are lined up next to each other.
+
+    Parameters:
+    histories (tuple[tuple[tuple[str,str],...],...]): history of each board
+    """
+    for start in range(0, len(histories), BOARDS_PER_ROW):
+        columns = []
+        for board in range(start, min(start + BOARDS_PER_ROW, len(histories))):
+            # Captures what print_history would print for this board
+            output = io.StringIO()
+            with redirect_stdout(output):
+                print_history(histories[board])
+            columns.append(
+                ['Board ' + str(board + 1)] + output.getvalue()[:-1].split('\n')
+            )
+        width = max(display_width(line) for column in columns
+                    for line in column)
+        for row in zip_longest(*columns, fillvalue=''):
+            print(BOARD_GAP.join(
+                line + ' ' * (width - display_width(line)) for line in row
+            ).rstrip())
 
 
 def update_stats(
@@ -285,7 +298,8 @@ def update_stats(
 
     A function that updates the stats tuple if a user wins or loses a game.
     Each win is broken down into how many guesses it took, whilst a loss is
-    simply tallied up
+    simply tallied up in the last position. Games with more than 6 guesses
+    use a longer stats tuple.
 
     Parameters:
     stats (tuple[int, ...]): Tuple containing scores for each game
@@ -296,12 +310,9 @@ def update_stats(
     Returns:
     tuple[int,...]: An updated version of the stats tuple with a won/loss added
     """
-    templist = list(stats)
-    if has_won(guess, answer):
-        templist[guess_number-1] += 1
-    else:
-        templist[6] += 1
-    return tuple(templist)
+    # Position of the count to increase, the last position counts losses
+    index = guess_number - 1 if has_won(guess, answer) else len(stats) - 1
+    return stats[:index] + (stats[index] + 1,) + stats[index + 1:]
 
 
 def print_stats(stats: tuple[int, ...]) -> None:
@@ -311,79 +322,255 @@ def print_stats(stats: tuple[int, ...]) -> None:
     stats (tuple[int, ...]): Tuple containing scores for each game
     """
     print('\nGames won in:')
-    for i in range(6):
+    for i in range(len(stats) - 1):
         print(str(i+1)+' moves: '+str(stats[i]))
-    print('Games lost: '+str(stats[6]))
+    print('Games lost: '+str(stats[-1]))
 
 
-def play_again() -> bool:
+def play_again(read: Callable[[str], str] = input) -> bool:
     """ Asks user if they want to play again
 
     A function that asks a user whether they would like to play another round
     of the game. If the user enters Y or y, they play another round. If they
     enter anything else, the game ends and the program terminates.
 
+    Parameters:
+    read (Callable[[str], str]): reads the user's input after a prompt
+
     Returns:
     bool: Boolean whether the userepresenting the users choice to play again
     """
-    choice = input('Would you like to play again (y/n)? ').lower()
+    choice = read('Would you like to play again (y/n)? ').lower()
     # Returns true if choice = y, and false if anything else
     return choice == 'y'
 
 
-def main():
+def parse_number(text: str, minimum: int, maximum: int) -> Optional[int]:
+    """ Returns a command line number, or None if it isn't a valid one
+
+    Parameters:
+    text (str): the number as given on the command line
+    minimum (int): smallest number allowed
+    maximum (int): largest number allowed
+
+    Returns:
+    int: the number, or None if text isn't a whole number in the range
+    """
+    if not text.isdigit() or not minimum <= int(text) <= maximum:
+        return None
+    return int(text)
+
+
+def max_guesses(board_count: int) -> int:
+    """ Returns the number of guesses allowed for board_count boards """
+    return board_count + EXTRA_GUESSES
+
+
+def play_boards(
+        board_count: int, length: int = WORD_LENGTH,
+        guess_limit: Optional[int] = None,
+        read: Callable[[str], str] = input,
+        dictionary: Optional[Dictionary] = None):
+    """ Game function for the multi-board modes
+
+    Coordinates gameplay when several answers are hidden at once. Every
+    guess is played on all unsolved boards, and the game is won once every
+    board is solved. Each board adds its own win or loss to the stats.
+
+    Parameters:
+    board_count (int): number of boards (hidden answers) in each game
+    length (int): number of letters in each word
+    guess_limit (int): guesses allowed, by default more for more boards
+    read (Callable[[str], str]): reads the user's input after a prompt
+    dictionary (Dictionary): where the words come from, by default the word
+                             list files
+    """
+    if guess_limit is None:
+        guess_limit = max_guesses(board_count)
+    stats = (0,) * (guess_limit + 1)
+    dictionary = dictionary or Dictionary()
+    answers = dictionary.get_answers(length)
+    vocab = dictionary.get_vocab(length)
+    if len(answers) < board_count:
+        print('Not enough answers of length ' + str(length) + '!')
+        return
+    from multiboard import MultiBoardGame
+    pool = AnswerPool(answers)
+    hints = None
+    while True:
+        if pool.remaining() < board_count:
+            pool.reset()
+        game = MultiBoardGame(tuple(pool.draw() for _ in range(board_count)))
+        # Loop for each game
+        while True:
+            guess_number = game.get_guess_number() + 1
+            # Loop for each guess
+            while True:
+                guess = prompt_user(
+                    guess_number, vocab, length=length, read=read
+                )
+                if guess == 'q':
+                    return
+                elif guess == 'k':
+                    for board in game.unsolved():
+                        print('\nBoard ' + str(board + 1), end='')
+                        print_keyboard(game.get_history(board))
+                elif guess == 'h':
+                    if hints is None:
+                        from hints import HintEngine
+                        hints = HintEngine(vocab, answers)
+                    # Help is given for the first unsolved board
+                    board = game.unsolved()[0]
+                    print_hint(*hints.hint(game.get_history(board)))
+                else:
+                    game.guess(guess)
+                    print_boards(game.get_histories())
+                    break
+            if game.is_solved():
+                print('Correct! You won in '+str(guess_number)+' guesses!')
+                break
+            elif has_lost(guess_number, guess_limit):
+                print('You lose! The answers were: ' +
+                      ', '.join(game.get_answers()))
+                break
+        # Solved boards stop at the winning guess, so each board's history
+        # ends with its final guess
+        for board, answer in enumerate(game.get_answers()):
+            history = game.get_history(board)
+            stats = update_stats(stats, len(history), history[-1][0], answer)
+        print_stats(stats)
+        if not play_again(read):
+            break
+
+
+def main(
+        mode: str = CLASSIC, hard: bool = False, length: int = WORD_LENGTH,
+        guess_limit: Optional[int] = None,
+        read: Callable[[str], str] = input,
+        dictionary: Optional[Dictionary] = None,
+        pool: Optional[AnswerPool] = None):
     """ Main game function
 
     The main function that coordinates the overall gameplay. This function
     utilises many other functions to orchestrate gameplay.
+    In absurdle mode the answer isn't chosen up front. Instead every guess
+    keeps the largest group of answers that would give the same squares.
+
+    Multi-board modes (see BOARD_COUNTS) are played by play_boards.
+    In hard mode every guess must reuse the letters revealed so far, and
+    hints only suggest guesses that hard mode allows.
+    Only the words of the chosen length are loaded.
+
+    Parameters:
+    mode (str): the game mode, one of MODES
+    hard (bool): whether to play classic or absurdle games in hard mode
+    length (int): number of letters in each word
+    guess_limit (int): guesses allowed in each game, by default MAX_GUESSES
+                       or more for more boards
+    read (Callable[[str], str]): reads the user's input after a prompt
+    dictionary (Dictionary): where the words come from, by default the word
+                             list files
+    pool (AnswerPool): draws the answer of each game, by default a shuffled
+                       pool of every answer
     """
+    if mode in BOARD_COUNTS:
+        play_boards(BOARD_COUNTS[mode], length, guess_limit, read, dictionary)
+        return
     # Initialising variables used in the game
-    stats = (0, 0, 0, 0, 0, 0, 0)
-    answers = load_words(ANSWERS_FILE)
-    vocab = load_words(VOCAB_FILE)
+    session = GameSession(MAX_GUESSES if guess_limit is None else guess_limit)
+    dictionary = dictionary or Dictionary()
+    answers = dictionary.get_answers(length)
+    vocab = dictionary.get_vocab(length)
+    if not answers:
+        print('No answers of length ' + str(length) + '!')
+        return
+    # Answers are drawn without replacement so they are always different
+    if pool is None:
+        pool = AnswerPool(answers)
+    if mode == ABSURDLE:
+        from absurdle import AdversarialAnswer
+    # Hints are only loaded the first time the user asks for help
+    hints = None
     # Main program loop -> will break from loop if user doesn't play again
     while True:
-        guess_number = 1
-        answer = choose_word(answers)
-        history = ()
+        if not pool.remaining():
+            # Every answer has been used, so start the cycle again
+            pool.reset()
+        answer = pool.draw()
+        # Adversary picks the squares for each guess in absurdle mode
+        adversary = AdversarialAnswer(answers) if mode == ABSURDLE else None
+        session.new_game(answer)
         # Loop for each game
         while True:
+            guess_number = session.get_guess_number()
             # Loop for each guess
             while True:
-                guess = prompt_user(guess_number, vocab)
+                rules = session.get_rules() if hard else None
+                guess = prompt_user(guess_number, vocab, rules, length, read)
                 # This ensures a guess isn't 'used' when a user enter q,k or h
                 if guess == 'q':
                     # User opts to quit
                     quit_option = 1
                     return
                 elif guess == 'k':
-                    print_keyboard(history)
+                    print(session.get_keyboard().format(), end='')
                 elif guess == 'h':
-                    print('Ah, you need help? Unfortunate.')
+                    if hints is None:
+                        from hints import HintEngine
+                        hints = HintEngine(vocab, answers, hard=hard)
+                    print_hint(*hints.hint(session.get_history(), rules))
+                elif adversary is not None:
+                    session.guess(guess, adversary.guess(guess))
+                    print_history(session.get_history())
+                    break
                 else:
-                    history = update_history(history, guess, answer)
-                    print_history(history)
+                    session.guess(guess)
+                    print_history(session.get_history())
                     break
-            if has_won(guess, answer):
+            if session.has_won():
                 # Used plural version of guesses
                 # Spec didn't mention case with 1 guess
                 print('Correct! You won in '+str(guess_number)+' guesses!')
                 break
-            elif has_lost(guess_number):
+            elif session.has_lost():
+                if adversary is not None:
+                    answer = adversary.get_answer()
                 print('You lose! The answer was: '+answer)
                 break
-            guess_number += 1
-        stats = update_stats(stats, guess_number, guess, answer)
-        print_stats(stats)
-        if not play_again():
+        session.finish_game()
+        print_stats(session.get_stats())
+        if not play_again(read):
             break
             # User has chosen to not play again
-        else:
-            # User is playing again
-            # Word is removed from answers
-            # Ensures answer is always different
-            answers = remove_word(answers, answer)
 
 
 if __name__ == "__main__":
-    main()
+    # Mode can be given on the command line, e.g. python a1.py absurdle hard
+    options = sys.argv[1:]
+    hard = HARD in options
+    length, guess_limit = WORD_LENGTH, None
+    modes = []
+    errors = []
+    for option in options:
+        if option.startswith(LENGTH_OPTION):
+            length = parse_number(
+                option[len(LENGTH_OPTION):], MIN_LENGTH, MAX_LENGTH
+            )
+            if length is None:
+                errors.append('Length must be from ' + str(MIN_LENGTH)
+                              + ' to ' + str(MAX_LENGTH) + '!')
+        elif option.startswith(GUESSES_OPTION):
+            guess_limit = parse_number(
+                option[len(GUESSES_OPTION):], 1, MAX_GUESS_LIMIT
+            )
+            if guess_limit is None:
+                errors.append('Guesses must be from 1 to '
+                              + str(MAX_GUESS_LIMIT) + '!')
+        elif option != HARD:
+            modes.append(option)
+    if modes and modes[0] not in MODES:
+        errors.append('Unknown mode! Choose from: ' + ', '.join(MODES))
+    if errors:
+        print('\n'.join(errors))
+    else:
+        main(*modes[:1], hard=hard, length=length, guess_limit=guess_limit)
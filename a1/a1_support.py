@@ -1,6 +1,9 @@
 from __future__ import annotations
 from random import choice, seed
 
+from vocabulary import Vocabulary
+from wordcache import load_compiled
+
 VOCAB_FILE = "vocab.txt"
 ANSWERS_FILE = "answers.txt"
 CORRECT = "🟩"
@@ -10,19 +13,21 @@ UNSEEN = " "
 
 # seed(1001.2022)
 
-def load_words(filename: str) -> tuple[str,...]:
+def load_words(filename: str) -> Vocabulary:
 	""" Loads all words from the file with the given name.
 
+	Words are read from a compiled copy of the file, which is rebuilt
+	whenever the file changes.
+
 	Parameters:
 		filename (str): The name of the file to load from. Each word must be on
 						a separate line.
 
 	Returns:
-		tuple<str>: A tuple containing all the words in the file.
+		Vocabulary: A tuple containing all the words in the file, indexed for
+					fast membership and prefix lookups.
 	"""
-	with open(filename, 'r') as file:
-		words = [line.strip() for line in file.readlines()]
-	return tuple(words)
+	return Vocabulary(load_compiled(filename))
 
 def choose_word(words: tuple[str,...]) -> str:
 	""" Chooses a word at random from words.
@@ -0,0 +1,54 @@
+"""
+Adversarial Wordle
+An answer that isn't chosen up front. Each guess is graded against every
+remaining candidate at once, and the candidates in the largest feedback
+bucket are kept, so the player is always given as little as possible.
+"""
+
+import numpy as np
+
+from feedback import encode_words, grade_many
+from patterns import POWERS, decode_pattern, winning_code
+
+
+class AdversarialAnswer:
+    """ Grades guesses by keeping the largest bucket of candidate answers """
+
+    def __init__(self, answers: tuple[str, ...]) -> None:
+        """ Starts with every answer as a candidate
+
+        Parameters:
+        answers (tuple[str, ...]): words that can be the answer
+        """
+        self._answers = tuple(answers)
+        self._encoded = encode_words(self._answers)
+        self._remaining = np.arange(len(self._answers))
+
+    def guess(self, guess: str) -> str:
+        """ Grades a guess, narrowing the candidates to the largest bucket
+
+        Ties between buckets go to the bucket that isn't a win, then to the
+        lowest pattern code, which has the fewest greens and yellows in
+        the last letters.
+
+        Parameters:
+        guess (str): the users guess
+
+        Returns:
+        str: square representation of guess against the kept bucket
+        """
+        codes = grade_many(guess, self._encoded[self._remaining])
+        sizes = np.bincount(codes, minlength=POWERS[len(guess)]).astype(float)
+        # Half a word less so a winning bucket only wins outright
+        sizes[winning_code(len(guess))] -= 0.5
+        code = int(np.argmax(sizes))
+        self._remaining = self._remaining[codes == code]
+        return decode_pattern(code, len(guess))
+
+    def get_remaining(self) -> tuple[str, ...]:
+        """ Returns the answers still consistent with every guess """
+        return tuple(self._answers[i] for i in self._remaining)
+
+    def get_answer(self) -> str:
+        """ Returns an answer consistent with every guess so far """
+        return self._answers[self._remaining[0]]
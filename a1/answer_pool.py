@@ -0,0 +1,86 @@
+"""
+Wordle answer pool
+Draws answers without replacement so no answer is repeated in a session.
+"""
+
+from random import Random
+from typing import Optional
+
+
+class AnswerPool:
+    """ A set of answers that are drawn at random without replacement
+
+    The words are kept in one array whose first remaining() entries are
+    the undrawn words. Each draw swaps a random undrawn word to the end of
+    that range and shrinks it, so drawing is O(1) and nothing is copied.
+    """
+
+    def __init__(
+            self, words: tuple[str, ...], seed: Optional[float] = None) -> None:
+        """ Creates a pool holding every word in words
+
+        Parameters:
+        words (tuple[str, ...]): the answers to draw from
+        seed (float): seed for the draws, or None for a random session
+        """
+        self._words = tuple(words)
+        self._seed = seed
+        self._random = Random()
+        self.reset()
+
+    def reset(self) -> None:
+        """ Puts every word back in the pool and restarts the draw sequence """
+        self._order = list(range(len(self._words)))
+        self._remaining = len(self._words)
+        self._random.seed(self._seed)
+
+    def remaining(self) -> int:
+        """ Returns the number of words that haven't been drawn """
+        return self._remaining
+
+    def remaining_words(self) -> tuple[str, ...]:
+        """ Returns the words that haven't been drawn, in no set order """
+        return tuple(self._words[i] for i in self._order[:self._remaining])
+
+    def draw(self) -> str:
+        """ Removes a random word from the pool and returns it
+
+        Returns:
+        str: the drawn word
+
+        Raises:
+        IndexError: if every word has been drawn
+        """
+        if not self._remaining:
+            raise IndexError('Every answer has been drawn')
+        position = self._random.randrange(self._remaining)
+        last = self._remaining - 1
+        order = self._order
+        order[position], order[last] = order[last], order[position]
+        self._remaining = last
+        return self._words[order[last]]
+
+    def snapshot(self) -> tuple:
+        """ Returns the state of the pool so that it can be restored later
+
+        Returns:
+        tuple: (word order, number remaining, random state), made only of
+               tuples and numbers so it can be pickled or saved as JSON
+        """
+        return tuple(self._order), self._remaining, self._random.getstate()
+
+    def restore(self, snapshot: tuple) -> None:
+        """ Returns the pool to the state it was in when snapshot was taken
+
+        Parameters:
+        snapshot (tuple): a value returned by snapshot on a pool of the
+                          same words
+        """
+        order, remaining, random_state = snapshot
+        if sorted(order) != list(range(len(self._words))):
+            raise ValueError('Snapshot is from a pool of different words')
+        self._order = list(order)
+        self._remaining = remaining
+        # JSON turns the nested tuples of a random state into lists
+        version, internal, gauss = random_state
+        self._random.setstate((version, tuple(internal), gauss))
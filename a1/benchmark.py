@@ -0,0 +1,496 @@
+"""
+Wordle benchmarks
+Checks the feedback kernel against a reference implementation, measures how
+many guesses per second it and the batched grader can grade, and compares
+startup time of the compiled word lists against the text loader, and
+compares the memory and grading speed of packed words against strings. Exits
+with status 1 if the kernels or compiled word lists differ from the reference.
+
+The suite times the engine end to end with fixed seeds and saves the results
+as JSON, which can be compared with the results of another commit.
+
+Run from the a1 directory:
+    python benchmark.py
+    python benchmark.py suite [results.json] [baseline.json] [threshold]
+"""
+
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+from a1 import process_guess
+from a1_support import (
+    load_words,
+    choose_word,
+    VOCAB_FILE,
+    ANSWERS_FILE,
+    CORRECT,
+    MISPLACED,
+    INCORRECT,
+)
+from constraints import ConstraintIndex
+from feedback import grade_many, grade_matrix
+from packed import (
+    grade_packed,
+    grade_packed_many,
+    pack_array,
+    pack_words,
+)
+from patterns import grade
+from simulation import SolverStrategy, simulate
+from solver import Solver
+from wordcache import compiled_path, load_compiled, read_text_words
+
+
+# Seed of every random choice made by the suite, as in a1_support
+SEED = 1001.2022
+RESULTS_FILE = 'benchmark.json'
+# Relative slowdown of a metric that counts as a regression
+REGRESSION_THRESHOLD = 0.2
+# Each suite timing is the best of this many runs, which filters out most
+# of the noise from other processes
+SUITE_REPEATS = 5
+SUITE_PAIRS = 20000
+SUITE_LOOKUPS = 100000
+SUITE_FILTERS = 200
+SUITE_GAMES = 20
+SUITE_SIMULATED = 229
+
+
+def reference_process_guess(guess: str, answer: str) -> str:
+    """ Straightforward implementation of the Wordle colouring rules
+
+    Greens are marked first and removed from the pool of answer letters,
+    then each remaining guess letter is yellow if a copy is left in the
+    pool. Kept deliberately simple so it can be trusted as a reference.
+
+    Parameters:
+    guess (str): the guess to grade
+    answer (str): the answer to grade against
+
+    Returns:
+    str: square representation of the guess
+    """
+    result = [INCORRECT] * len(guess)
+    remaining = list(answer)
+    for i, char in enumerate(guess):
+        if char == answer[i]:
+            result[i] = CORRECT
+            remaining.remove(char)
+    for i, char in enumerate(guess):
+        if result[i] != CORRECT and char in remaining:
+            result[i] = MISPLACED
+            remaining.remove(char)
+    return ''.join(result)
+
+
+def check_equivalence(
+        guesses: tuple[str, ...],
+        answers: tuple[str, ...]) -> list[tuple[str, str]]:
+    """ Compares process_guess with the reference on every pair of words
+
+    Parameters:
+    guesses (tuple[str, ...]): words to guess
+    answers (tuple[str, ...]): answers to grade each guess against
+
+    Returns:
+    list[tuple[str, str]]: every (guess, answer) pair that differs
+    """
+    mismatches = []
+    for guess in guesses:
+        for answer in answers:
+            if (process_guess(guess, answer)
+                    != reference_process_guess(guess, answer)):
+                mismatches.append((guess, answer))
+    return mismatches
+
+
+def guesses_per_second(
+        function, guesses: tuple[str, ...],
+        answers: tuple[str, ...]) -> float:
+    """ Measures how many (guess, answer) pairs function grades per second
+
+    Parameters:
+    function (Callable[[str, str], object]): grading function to time
+    guesses (tuple[str, ...]): words to guess
+    answers (tuple[str, ...]): answers to grade each guess against
+
+    Returns:
+    float: number of guesses graded per second
+    """
+    start = time.perf_counter()
+    for guess in guesses:
+        for answer in answers:
+            function(guess, answer)
+    elapsed = time.perf_counter() - start
+    return len(guesses) * len(answers) / elapsed
+
+
+def seconds_per_call(function, *args, repeats: int = 20) -> float:
+    """ Returns the average time function(*args) takes, in seconds """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function(*args)
+    return (time.perf_counter() - start) / repeats
+
+
+def text_load_words(filename: str) -> tuple[str, ...]:
+    """ The original text loader, kept as the startup baseline """
+    with open(filename, 'r') as file:
+        words = [line.strip() for line in file.readlines()]
+    return tuple(words)
+
+
+def benchmark_loading() -> list[str]:
+    """ Compares loading the word lists from text and compiled files
+
+    Returns:
+    list[str]: word list files whose compiled words differ from the text
+    """
+    differing = []
+    for filename in (VOCAB_FILE, ANSWERS_FILE):
+        text = seconds_per_call(text_load_words, filename)
+        # Cold start: the compiled file has to be built from the text file
+        cold = 0
+        for _ in range(5):
+            if os.path.exists(compiled_path(filename)):
+                os.remove(compiled_path(filename))
+            cold += seconds_per_call(load_compiled, filename, repeats=1) / 5
+        warm = seconds_per_call(load_compiled, filename)
+        if load_compiled(filename) != read_text_words(filename):
+            differing.append(filename)
+        print(f'{filename}: text {text * 1000:.2f} ms, compiled cold '
+              f'{cold * 1000:.2f} ms, compiled warm {warm * 1000:.2f} ms')
+    return differing
+
+
+def benchmark_packed(
+        vocab: tuple[str, ...], answers: tuple[str, ...]) -> int:
+    """ Compares packed words against strings for memory and grading
+
+    Returns:
+    int: number of pairs the packed kernels grade differently to the str
+         kernels
+    """
+    strings = sys.getsizeof(vocab) + sum(map(sys.getsizeof, vocab))
+    packed = pack_words(vocab)
+    packed_array = pack_array(vocab)
+    print(f'Memory for {len(vocab)} words: str tuple {strings:,} bytes, '
+          f'array {packed.itemsize * len(packed):,} bytes, '
+          f'numpy {packed_array.nbytes:,} bytes')
+
+    sample = vocab[::20]
+    packed_sample = tuple(pack_words(sample))
+    packed_answers = tuple(pack_words(answers))
+    mismatches = sum(
+        grade(guess, answer) != grade_packed(packed_guess, packed_answer)
+        for guess, packed_guess in zip(sample, packed_sample)
+        for answer, packed_answer in zip(answers, packed_answers)
+    )
+    answer_array = pack_array(answers)
+    mismatches += sum(
+        int(np.count_nonzero(grade_many(guess, answers)
+                             != grade_packed_many(packed_guess, answer_array)))
+        for guess, packed_guess in zip(sample, packed_sample)
+    )
+    print(f'Packed equivalence: {2 * len(sample) * len(answers)} pairs '
+          f'checked, {mismatches} mismatches')
+    rates = {}
+    for name, function, guesses, targets in (
+            ('grade (str)', grade, sample, answers),
+            ('grade_packed', grade_packed, packed_sample, packed_answers)):
+        rates[name] = guesses_per_second(function, guesses, targets)
+        print(f'{name}: {rates[name]:,.0f} guesses/s')
+    # CPython's int bit operations cost more than its str operations
+    ratio = rates['grade_packed'] / rates['grade (str)']
+    print(f'grade_packed runs at {ratio:.2f}x grade (str)')
+
+    for name, function, guesses, targets in (
+            ('grade_many (str)', grade_many, sample, answers),
+            ('grade_packed_many', grade_packed_many, packed_sample,
+             answer_array)):
+        start = time.perf_counter()
+        for guess in guesses:
+            function(guess, targets)
+        elapsed = time.perf_counter() - start
+        print(f'{name}: {len(guesses) * len(answers) / elapsed:,.0f} '
+              'guesses/s')
+    return mismatches
+
+
+def best_time(function, *args, repeats: int = SUITE_REPEATS) -> float:
+    """ Returns the shortest time function(*args) takes, in seconds """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def metric(value: float, unit: str, higher_is_better: bool) -> dict:
+    """ Returns a suite result in the layout saved to JSON """
+    return {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+
+
+def suite_loading(filename: str) -> dict[str, dict]:
+    """ Times load_words with its compiled file missing and present """
+    name = os.path.splitext(filename)[0]
+    cold = []
+    for _ in range(SUITE_REPEATS):
+        if os.path.exists(compiled_path(filename)):
+            os.remove(compiled_path(filename))
+        cold.append(best_time(load_words, filename, repeats=1))
+    return {
+        f'load_{name}_cold': metric(min(cold) * 1000, 'ms', False),
+        f'load_{name}_warm': metric(
+            best_time(load_words, filename) * 1000, 'ms', False),
+    }
+
+
+def suite_process_guess(
+        vocab: tuple[str, ...], answers: tuple[str, ...]) -> dict[str, dict]:
+    """ Times process_guess on seeded random (guess, answer) pairs """
+    pairs = [(choose_word(vocab), choose_word(answers))
+             for _ in range(SUITE_PAIRS)]
+
+    def grade_pairs() -> None:
+        for guess, answer in pairs:
+            process_guess(guess, answer)
+
+    return {'process_guess': metric(
+        SUITE_PAIRS / best_time(grade_pairs), 'guesses/s', True)}
+
+
+def suite_membership(vocab: tuple[str, ...]) -> dict[str, dict]:
+    """ Times vocab membership checks, half of them for unknown words """
+    words = [choose_word(vocab) for _ in range(SUITE_LOOKUPS // 2)]
+    # Reversed words are almost never words, so these mostly miss
+    words += [word[::-1] for word in words]
+
+    def check() -> None:
+        for word in words:
+            word in vocab
+
+    return {'membership': metric(
+        len(words) / best_time(check), 'lookups/s', True)}
+
+
+def seeded_histories(
+        vocab: tuple[str, ...], answers: tuple[str, ...], count: int,
+        turns: int) -> list[tuple[tuple[str, str], ...]]:
+    """ Returns histories of turns random guesses at seeded random answers """
+    histories = []
+    for _ in range(count):
+        answer = choose_word(answers)
+        history = ()
+        for _ in range(turns):
+            guess = choose_word(vocab)
+            history += ((guess, process_guess(guess, answer)),)
+        histories.append(history)
+    return histories
+
+
+def suite_filtering(
+        vocab: tuple[str, ...], answers: tuple[str, ...]) -> dict[str, dict]:
+    """ Times finding the answers left after two seeded random guesses """
+    index = ConstraintIndex(answers)
+    histories = seeded_histories(vocab, answers, SUITE_FILTERS, 2)
+
+    def filter_all() -> None:
+        for history in histories:
+            index.candidates(history)
+
+    return {'filtering': metric(
+        best_time(filter_all) / SUITE_FILTERS * 1e6, 'us', False)}
+
+
+def suite_solver(
+        vocab: tuple[str, ...], answers: tuple[str, ...]) -> dict[str, dict]:
+    """ Times the solver's decision at each turn of seeded games
+
+    The solver's rankings are cleared before each decision, so every turn
+    is timed from scratch rather than read from the solver's cache.
+    """
+    solver = Solver(vocab, answers)
+    turn_times = {}
+    for _ in range(SUITE_GAMES):
+        answer = choose_word(answers)
+        history = ()
+        while not history or history[-1][0] != answer:
+            # Setting the strategy again clears the cached rankings
+            solver.set_strategy(solver.get_strategy())
+            start = time.perf_counter()
+            guess = solver.best_guess(history)
+            turn_times.setdefault(len(history) + 1, []).append(
+                time.perf_counter() - start)
+            history += ((guess, process_guess(guess, answer)),)
+    return {
+        f'solver_turn_{turn}': metric(float(np.median(times)) * 1000, 'ms',
+                                      False)
+        for turn, times in sorted(turn_times.items())
+    }
+
+
+def suite_simulation(answers: tuple[str, ...]) -> dict[str, dict]:
+    """ Measures full games per second on one worker
+
+    The opening book isn't used, so the result doesn't depend on whether
+    one has been built.
+    """
+    games = tuple(choose_word(answers) for _ in range(SUITE_SIMULATED))
+    _, report = simulate(games, SolverStrategy(use_book=False), workers=1)
+    return {'simulation': metric(
+        report['games_per_second'], 'games/s', True)}
+
+
+def run_suite() -> dict:
+    """ Runs every suite benchmark with the random module seeded by SEED
+
+    Returns:
+    dict: the environment the suite ran in and each metric's value, unit
+          and whether higher is better, ready to be saved as JSON
+    """
+    random.seed(SEED)
+    metrics = {}
+    for filename in (VOCAB_FILE, ANSWERS_FILE):
+        metrics.update(suite_loading(filename))
+    vocab = load_words(VOCAB_FILE)
+    answers = load_words(ANSWERS_FILE)
+    metrics.update(suite_process_guess(vocab, answers))
+    metrics.update(suite_membership(vocab))
+    metrics.update(suite_filtering(vocab, answers))
+    metrics.update(suite_solver(vocab, answers))
+    metrics.update(suite_simulation(answers))
+    return {
+        'seed': SEED,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'metrics': metrics,
+    }
+
+
+def compare_results(
+        baseline: dict, current: dict,
+        threshold: float = REGRESSION_THRESHOLD) -> list[tuple[str, float]]:
+    """ Finds the metrics that got worse by more than threshold
+
+    Parameters:
+    baseline (dict): results of run_suite to compare against
+    current (dict): results of run_suite to check
+    threshold (float): relative change allowed, e.g. 0.2 for 20%
+
+    Returns:
+    list[tuple[str, float]]: each regressed metric and its relative change,
+        positive for slower
+    """
+    regressions = []
+    for name, result in current['metrics'].items():
+        if name not in baseline['metrics']:
+            continue
+        before = baseline['metrics'][name]['value']
+        after = result['value']
+        if not before or not after:
+            continue
+        if result['higher_is_better']:
+            change = before / after - 1
+        else:
+            change = after / before - 1
+        if change > threshold:
+            regressions.append((name, change))
+    return regressions
+
+
+def print_results(results: dict, baseline: Optional[dict] = None) -> None:
+    """ Prints suite results, with the change from baseline if given """
+    for name, result in results['metrics'].items():
+        line = f"{name}: {result['value']:,.3f} {result['unit']}"
+        if baseline is not None and name in baseline['metrics']:
+            before = baseline['metrics'][name]['value']
+            change = result['value'] / before - 1 if before else 0.0
+            line += f' (was {before:,.3f}, {change:+.1%})'
+        print(line)
+
+
+def suite_main(arguments: list[str]) -> None:
+    """ Runs the suite, saves its results and checks them against a baseline
+
+    Parameters:
+    arguments (list[str]): [results file] [baseline file] [threshold]
+    """
+    path = arguments[0] if arguments else RESULTS_FILE
+    threshold = (float(arguments[2]) if len(arguments) > 2
+                 else REGRESSION_THRESHOLD)
+    baseline = None
+    if len(arguments) > 1:
+        with open(arguments[1]) as file:
+            baseline = json.load(file)
+    results = run_suite()
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+    print_results(results, baseline)
+    print(f'Saved to {path}')
+    if baseline is not None:
+        regressions = compare_results(baseline, results, threshold)
+        for name, change in regressions:
+            print(f'Regression: {name} is {change:.1%} worse')
+        if regressions:
+            sys.exit(1)
+
+
+def main():
+    """ Runs the equivalence checks and the benchmarks
+
+    Exits with status 1 without benchmarking if the compiled word lists or
+    process_guess don't match their references, and with status 1 after
+    benchmarking if the packed kernels don't match the str kernels.
+    """
+    differing = benchmark_loading()
+    for filename in differing:
+        print(f'Compiled words of {filename} differ from the text file')
+    answers = load_words(ANSWERS_FILE)
+    vocab = load_words(VOCAB_FILE)
+
+    mismatches = check_equivalence(vocab, answers)
+    print(f'Equivalence: {len(vocab) * len(answers)} pairs checked, '
+          f'{len(mismatches)} mismatches')
+    for guess, answer in mismatches[:10]:
+        print(f'  {guess} vs {answer}: {process_guess(guess, answer)} != '
+              f'{reference_process_guess(guess, answer)}')
+    if differing or mismatches:
+        sys.exit(1)
+
+    # A slice of the vocab keeps the timing runs to a few seconds each
+    sample = vocab[::20]
+    for name, function in (
+            ('grade', grade),
+            ('process_guess', process_guess),
+            ('reference', reference_process_guess)):
+        rate = guesses_per_second(function, sample, answers)
+        print(f'{name}: {rate:,.0f} guesses/s')
+
+    packed_mismatches = benchmark_packed(vocab, answers)
+
+    start = time.perf_counter()
+    grade_matrix(vocab, answers)
+    elapsed = time.perf_counter() - start
+    print(f'grade_matrix: {len(vocab) * len(answers) / elapsed:,.0f} '
+          'guesses/s')
+    if packed_mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['suite']:
+        suite_main(sys.argv[2:])
+    else:
+        main()
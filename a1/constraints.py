@@ -0,0 +1,229 @@
+"""
+Wordle constraint index
+Narrows the words that are consistent with a game history using precomputed
+bitsets, one bit per word, instead of re-grading every word.
+"""
+
+from typing import Optional
+
+from a1_support import CORRECT, MISPLACED
+
+
+class ConstraintIndex:
+    """ Bitsets over a word list for the facts feedback can reveal
+
+    A set of words is an int whose bit i is set when words[i] is in the
+    set, so intersecting two sets is a single & over len(words) / 64
+    machine words. The index holds a bitset for every (position, letter)
+    pair and for every "letter appears at least k times" fact; a letter
+    being absent is the complement of it appearing at least once.
+    """
+
+    def __init__(self, words: tuple[str, ...]) -> None:
+        """ Builds the bitsets for words
+
+        Parameters:
+        words (tuple[str, ...]): the words to index, e.g. the answers
+        """
+        self._words = tuple(words)
+        self._all = (1 << len(self._words)) - 1
+        positions = {}
+        counts = {}
+        for i, word in enumerate(self._words):
+            seen = {}
+            for position, letter in enumerate(word):
+                positions.setdefault((position, letter), []).append(i)
+                seen[letter] = seen.get(letter, 0) + 1
+                counts.setdefault((letter, seen[letter]), []).append(i)
+        self._positions = {
+            key: self._to_bitset(indices) for key, indices in positions.items()
+        }
+        self._at_least = {
+            key: self._to_bitset(indices) for key, indices in counts.items()
+        }
+
+    def get_words(self) -> tuple[str, ...]:
+        """ Returns the indexed words, in bit order """
+        return self._words
+
+    def full(self) -> int:
+        """ Returns the state holding every word """
+        return self._all
+
+    def letter_at(self, position: int, letter: str) -> int:
+        """ Returns the words with letter at position """
+        return self._positions.get((position, letter), 0)
+
+    def at_least(self, letter: str, count: int) -> int:
+        """ Returns the words containing letter at least count times """
+        if count <= 0:
+            return self._all
+        return self._at_least.get((letter, count), 0)
+
+    def absent(self, letter: str) -> int:
+        """ Returns the words that don't contain letter """
+        return self._all & ~self.at_least(letter, 1)
+
+    def feedback_mask(self, guess: str, feedback: str) -> int:
+        """ Returns the words that would give feedback for guess
+
+        Parameters:
+        guess (str): a guessed word
+        feedback (str): square representation of guess from process_guess
+
+        Returns:
+        int: bitset of every indexed word consistent with the feedback
+        """
+        mask = self._all
+        found = {}
+        repeated = set()
+        for position, (letter, square) in enumerate(zip(guess, feedback)):
+            if square == CORRECT:
+                mask &= self.letter_at(position, letter)
+            else:
+                mask &= ~self.letter_at(position, letter)
+            if square == CORRECT or square == MISPLACED:
+                found[letter] = found.get(letter, 0) + 1
+            else:
+                # A black square means every copy of letter has been found
+                repeated.add(letter)
+                found.setdefault(letter, 0)
+        for letter, count in found.items():
+            mask &= self.at_least(letter, count)
+            if letter in repeated:
+                mask &= ~self.at_least(letter, count + 1)
+        return mask
+
+    def narrow(self, state: int, guess: str, feedback: str) -> int:
+        """ Returns the words in state that are consistent with one guess
+
+        Parameters:
+        state (int): bitset of the words still possible
+        guess (str): a guessed word
+        feedback (str): square representation of guess from process_guess
+
+        Returns:
+        int: the narrowed bitset
+        """
+        return state & self.feedback_mask(guess, feedback)
+
+    def state(self, history: tuple[tuple[str, str], ...]) -> int:
+        """ Returns the bitset of the words consistent with history
+
+        Parameters:
+        history (tuple[tuple[str,str],...]): Tuple with guess words and squares
+
+        Returns:
+        int: bitset of every consistent word
+        """
+        state = self._all
+        for guess, feedback in history:
+            state = self.narrow(state, guess, feedback)
+        return state
+
+    def candidates(
+            self, history: tuple[tuple[str, str], ...]) -> tuple[str, ...]:
+        """ Returns the words consistent with history
+
+        Parameters:
+        history (tuple[tuple[str,str],...]): Tuple with guess words and squares
+
+        Returns:
+        tuple[str, ...]: every consistent word, in word list order
+        """
+        return self.words_in(self.state(history))
+
+    def indices(self, state: int) -> list[int]:
+        """ Returns the positions of the words in a bitset """
+        # Reading the binary string is much faster than shifting a big int
+        bits = bin(state)[:1:-1]
+        return [i for i, bit in enumerate(bits) if bit == '1']
+
+    def words_in(self, state: int) -> tuple[str, ...]:
+        """ Returns the words in a bitset, in word list order """
+        return tuple(self._words[i] for i in self.indices(state))
+
+    def count(self, state: int) -> int:
+        """ Returns the number of words in a bitset """
+        return bin(state).count('1')
+
+    def _to_bitset(self, indices: list[int]) -> int:
+        """ Returns the bitset with the bits at indices set """
+        bits = bytearray((len(self._words) + 7) // 8)
+        for i in indices:
+            bits[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(bits, 'little')
+
+
+class HardModeRules:
+    """ What hard mode requires of the next guess, kept up to date per guess
+
+    Every green letter must be guessed in the same position again, and
+    every revealed letter must be used at least as many times as it was
+    shown green or yellow in a single guess.
+    """
+
+    def __init__(self) -> None:
+        """ Creates rules for a game with no guesses """
+        self._greens = {}
+        self._minimums = {}
+
+    def update(self, guess: str, feedback: str) -> None:
+        """ Adds the letters revealed by one guess
+
+        Parameters:
+        guess (str): a guessed word
+        feedback (str): square representation of guess from process_guess
+        """
+        found = {}
+        for position, (letter, square) in enumerate(zip(guess, feedback)):
+            if square == CORRECT:
+                self._greens[position] = letter
+            if square == CORRECT or square == MISPLACED:
+                found[letter] = found.get(letter, 0) + 1
+        for letter, count in found.items():
+            if count > self._minimums.get(letter, 0):
+                self._minimums[letter] = count
+
+    def get_greens(self) -> dict[int, str]:
+        """ Returns the letter that must be guessed at each known position """
+        return dict(self._greens)
+
+    def get_minimums(self) -> dict[str, int]:
+        """ Returns how many times each revealed letter must be used """
+        return dict(self._minimums)
+
+    def violation(self, guess: str) -> Optional[str]:
+        """ Returns why guess breaks the rules, or None if it doesn't
+
+        Parameters:
+        guess (str): the users guess
+
+        Returns:
+        str: a description of the first broken rule, or None
+        """
+        for position, letter in sorted(self._greens.items()):
+            if guess[position] != letter:
+                return (f'Letter {position + 1} must be '
+                        f'{letter.upper()}')
+        for letter, count in sorted(self._minimums.items()):
+            if guess.count(letter) < count:
+                times = '' if count == 1 else f' {count} times'
+                return f'Guess must contain {letter.upper()}{times}'
+        return None
+
+    def legal(self, index: ConstraintIndex) -> int:
+        """ Returns the bitset of the indexed words that follow the rules
+
+        Parameters:
+        index (ConstraintIndex): index over the words that can be guessed
+
+        Returns:
+        int: bitset of every word that hard mode allows
+        """
+        state = index.full()
+        for position, letter in self._greens.items():
+            state &= index.letter_at(position, letter)
+        for letter, count in self._minimums.items():
+            state &= index.at_least(letter, count)
+        return state
@@ -0,0 +1,454 @@
+"""
+Wordle decision tree
+Builds a tree holding the guess to play after every feedback pattern, checks
+that it solves every answer within the allowed guesses and stores it in a
+compact binary file, so a hint is a walk of at most six nodes.
+
+Run from the a1 directory: python decision_tree.py [workers]
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+
+import numpy as np
+
+from a1_support import load_words, VOCAB_FILE, ANSWERS_FILE
+from feedback import FeedbackMatrix, words_hash
+from patterns import encode_pattern, winning_code
+from session import MAX_GUESSES
+from sharedmem import attach_feedback, publish_feedback
+from solver import Solver
+from wordcache import CACHE_DIR
+
+
+# A tree is (vocab index of the guess, {pattern code: subtree}). The pattern
+# of a correct guess has no subtree.
+Tree = tuple[int, dict]
+
+# Best ranked guesses tried at a node before the node is given up on
+GUESS_TRIES = 10
+TREE_FILE = 'tree-{}.wdt'
+CHECKPOINT_DIR = 'tree-v2-{}.parts'
+CHECKPOINT_FILE = '{}-{}.part'
+MAGIC = b'WDT2'
+# magic, sha1 of the vocab and answers, most guesses needed, node count
+HEADER = struct.Struct('<4s20sHI')
+# vocab index of the guess, number of children. Indexes are 32 bit so any
+# vocab fits, while a node has at most one child per pattern code.
+NODE = struct.Struct('<IH')
+# pattern code, offset of the child node from the first node
+CHILD = struct.Struct('<HI')
+
+# Builder used by the subtrees built in this worker process
+_worker_builder = None
+
+
+class TreeBuilder:
+    """ Builds decision trees with a Solver choosing the guess at each node
+
+    Each node plays the solver's best guess for its candidates. If that
+    guess leaves a branch that can't be solved in the guesses remaining,
+    the next best guesses are tried before the node fails.
+    """
+
+    def __init__(
+            self, vocab: tuple[str, ...], answers: tuple[str, ...],
+            matrix: Optional[FeedbackMatrix] = None) -> None:
+        """ Creates a builder over vocab and answers
+
+        Parameters:
+        vocab (tuple[str, ...]): words that can be guessed
+        answers (tuple[str, ...]): words that can be the answer
+        matrix (FeedbackMatrix): matrix of vocab against answers, loaded
+                                 from the cache if not given
+        """
+        self._solver = Solver(vocab, answers, matrix=matrix)
+        matrix = self._solver.get_matrix()
+        self._patterns = self._solver.get_patterns()
+        self._answer_rows = np.array(
+            [matrix.guess_index(answer) for answer in answers]
+        )
+        self._win = winning_code(len(answers[0]))
+
+    def get_solver(self) -> Solver:
+        """ Returns the solver choosing the guesses """
+        return self._solver
+
+    def split(
+            self, guess: int,
+            candidates: np.ndarray) -> dict[int, np.ndarray]:
+        """ Groups candidates by their pattern against guess
+
+        Parameters:
+        guess (int): vocab index of the guess
+        candidates (np.ndarray): answer indices of the candidates
+
+        Returns:
+        dict[int, np.ndarray]: candidates for each pattern code other than
+                               the winning pattern
+        """
+        codes = self._patterns[guess, candidates]
+        return {
+            int(code): candidates[codes == code]
+            for code in np.unique(codes) if code != self._win
+        }
+
+    def build(
+            self, candidates: np.ndarray,
+            guesses_left: int = MAX_GUESSES) -> Optional[Tree]:
+        """ Builds a tree solving every candidate in guesses_left guesses
+
+        Parameters:
+        candidates (np.ndarray): answer indices of the candidates
+        guesses_left (int): guesses allowed, including the final guess
+
+        Returns:
+        Tree: the tree, or None if no tree was found
+        """
+        if len(candidates) == 1:
+            return int(self._answer_rows[candidates[0]]), {}
+        if guesses_left <= 1:
+            # One guess can't separate two or more candidates
+            return None
+        for guess in self._solver.rank_candidates(candidates, GUESS_TRIES):
+            children = {}
+            for code, subset in self.split(guess, candidates).items():
+                child = self.build(subset, guesses_left - 1)
+                if child is None:
+                    break
+                children[code] = child
+            else:
+                return guess, children
+        return None
+
+    def guess_counts(self, tree: Tree) -> list[int]:
+        """ Plays every answer through tree
+
+        Parameters:
+        tree (Tree): a decision tree over the answers
+
+        Returns:
+        list[int]: number of guesses each answer takes, in answer order
+
+        Raises:
+        ValueError: if an answer reaches a pattern the tree doesn't cover
+        """
+        counts = []
+        for answer in range(self._patterns.shape[1]):
+            node = tree
+            count = 1
+            while True:
+                guess, children = node
+                code = int(self._patterns[guess, answer])
+                if code == self._win:
+                    break
+                if code not in children:
+                    raise ValueError(f'Tree does not cover answer {answer}')
+                node = children[code]
+                count += 1
+            counts.append(count)
+        return counts
+
+
+def serialise(tree: Tree) -> bytes:
+    """ Packs a tree into its binary form
+
+    Nodes are stored in preorder. Each node is its guess and child count
+    followed by a (pattern code, offset) entry per child, sorted by code
+    so lookups can binary search them.
+
+    Parameters:
+    tree (Tree): the tree to pack
+
+    Returns:
+    bytes: the packed nodes
+    """
+    records = []
+
+    def add(node: Tree) -> int:
+        """ Appends node and its subtrees, returning the node's position """
+        guess, children = node
+        record = (guess, [])
+        records.append(record)
+        position = len(records) - 1
+        for code in sorted(children):
+            record[1].append((code, add(children[code])))
+        return position
+
+    add(tree)
+    offsets = []
+    offset = 0
+    for _, children in records:
+        offsets.append(offset)
+        offset += NODE.size + CHILD.size * len(children)
+    data = bytearray()
+    for guess, children in records:
+        data += NODE.pack(guess, len(children))
+        for code, position in children:
+            data += CHILD.pack(code, offsets[position])
+    return bytes(data)
+
+
+def deserialise(data: bytes, offset: int = 0) -> Tree:
+    """ Unpacks the tree whose root node is at offset
+
+    Parameters:
+    data (bytes): packed nodes made by serialise
+    offset (int): offset of the root node
+
+    Returns:
+    Tree: the unpacked tree
+    """
+    guess, count = NODE.unpack_from(data, offset)
+    children = {}
+    for i in range(count):
+        code, child = CHILD.unpack_from(
+            data, offset + NODE.size + i * CHILD.size
+        )
+        children[code] = deserialise(data, child)
+    return guess, children
+
+
+def count_nodes(tree: Tree) -> int:
+    """ Returns the number of nodes in tree """
+    return 1 + sum(count_nodes(child) for child in tree[1].values())
+
+
+def tree_path(vocab: tuple[str, ...], answers: tuple[str, ...],
+              cache_dir: str = CACHE_DIR) -> str:
+    """ Returns where the tree for vocab and answers is stored """
+    return os.path.join(
+        cache_dir, TREE_FILE.format(words_hash(vocab, answers))
+    )
+
+
+def checkpoint_path(vocab: tuple[str, ...], answers: tuple[str, ...],
+                    cache_dir: str = CACHE_DIR) -> str:
+    """ Returns the directory the subtrees of a tree build are stored in """
+    return os.path.join(
+        cache_dir, CHECKPOINT_DIR.format(words_hash(vocab, answers))
+    )
+
+
+def save_tree(
+        tree: Tree, path: str, digest: str, max_guesses: int) -> None:
+    """ Writes a tree and its header to path
+
+    Parameters:
+    tree (Tree): the tree to store
+    path (str): file to write
+    digest (str): words_hash of the vocab and answers the tree is for
+    max_guesses (int): most guesses any answer needs
+    """
+    data = serialise(tree)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(HEADER.pack(
+            MAGIC, bytes.fromhex(digest), max_guesses, count_nodes(tree)
+        ))
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def _init_worker(specs: dict) -> None:
+    """ Creates the builder used by a worker process
+
+    Parameters:
+    specs (dict): specs of the feedback matrix published in shared memory
+    """
+    global _worker_builder
+    matrix = attach_feedback(specs)
+    _worker_builder = TreeBuilder(
+        matrix.get_guesses(), matrix.get_answers(), matrix
+    )
+
+
+def _build_part(candidates: np.ndarray, guesses_left: int) -> Optional[bytes]:
+    """ Builds one subtree in a worker process, returning it packed """
+    subtree = _worker_builder.build(candidates, guesses_left)
+    return None if subtree is None else serialise(subtree)
+
+
+def build_tree(
+        vocab: tuple[str, ...], answers: tuple[str, ...],
+        workers: Optional[int] = None, cache_dir: str = CACHE_DIR) -> Tree:
+    """ Builds a tree solving every answer within MAX_GUESSES guesses
+
+    The root guess is chosen here and each of its subtrees is built by a
+    process pool. Finished subtrees are written to a checkpoint directory,
+    so an interrupted build only rebuilds the subtrees it hadn't finished.
+    The directory is kept until the tree is saved (see main).
+
+    Parameters:
+    vocab (tuple[str, ...]): words that can be guessed
+    answers (tuple[str, ...]): words that can be the answer
+    workers (int): number of worker processes, defaults to the CPU count
+    cache_dir (str): directory the checkpoints are stored in
+
+    Returns:
+    Tree: the decision tree
+
+    Raises:
+    ValueError: if no tree solves every answer in time
+    """
+    builder = TreeBuilder(vocab, answers)
+    candidates = np.arange(len(answers))
+    parts_dir = checkpoint_path(vocab, answers, cache_dir)
+    os.makedirs(parts_dir, exist_ok=True)
+    roots = builder.get_solver().rank_candidates(candidates, GUESS_TRIES)
+    # Workers share one copy of the matrix instead of loading their own
+    with publish_feedback(builder.get_solver().get_matrix()) as shared, \
+            ProcessPoolExecutor(
+                workers, initializer=_init_worker,
+                initargs=(shared.get_specs(),)) as executor:
+        for root in roots:
+            children = {}
+            futures = {}
+            for code, subset in builder.split(root, candidates).items():
+                path = os.path.join(
+                    parts_dir, CHECKPOINT_FILE.format(root, code)
+                )
+                if os.path.exists(path):
+                    with open(path, 'rb') as file:
+                        children[code] = deserialise(file.read())
+                else:
+                    future = executor.submit(
+                        _build_part, subset, MAX_GUESSES - 1
+                    )
+                    futures[future] = code, path
+            failed = False
+            for future in as_completed(futures):
+                code, path = futures[future]
+                data = future.result()
+                if data is None:
+                    failed = True
+                    break
+                # Written then renamed so a checkpoint is never partial
+                with open(path + '.tmp', 'wb') as file:
+                    file.write(data)
+                os.replace(path + '.tmp', path)
+                children[code] = deserialise(data)
+            if failed:
+                for future in futures:
+                    future.cancel()
+                continue
+            tree = root, children
+            # Checkpoints are trusted, so check the whole tree once more
+            if max(builder.guess_counts(tree)) <= MAX_GUESSES:
+                return tree
+    raise ValueError(
+        f'No decision tree solves every answer in {MAX_GUESSES} guesses'
+    )
+
+
+class DecisionTree:
+    """ A stored decision tree, read through a memory map
+
+    Only the nodes on the path of a history are read, so a lookup is at
+    most MAX_GUESSES node reads plus a binary search of each node's
+    children.
+    """
+
+    def __init__(
+            self, vocab: tuple[str, ...], answers: tuple[str, ...],
+            path: Optional[str] = None) -> None:
+        """ Opens the tree built for vocab and answers
+
+        Parameters:
+        vocab (tuple[str, ...]): words that can be guessed
+        answers (tuple[str, ...]): words that can be the answer
+        path (str): tree file, defaults to the one in the cache
+
+        Raises:
+        FileNotFoundError: if the tree hasn't been built
+        ValueError: if the file isn't a tree for vocab and answers, or is
+                    truncated
+        """
+        self._vocab = tuple(vocab)
+        path = path or tree_path(vocab, answers)
+        with open(path, 'rb') as file:
+            # Raises ValueError for an empty file
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._data) < HEADER.size:
+            raise ValueError(f'{path} is truncated')
+        magic, digest, max_guesses, nodes = HEADER.unpack_from(self._data)
+        if (magic != MAGIC
+                or digest.hex() != words_hash(vocab, answers)):
+            raise ValueError(f'{path} is not a tree for these word lists')
+        # Every node but the root is the child of one other node
+        size = HEADER.size + nodes * NODE.size + (nodes - 1) * CHILD.size
+        if nodes < 1 or len(self._data) != size:
+            raise ValueError(f'{path} is truncated')
+        self._max_guesses = max_guesses
+
+    def get_max_guesses(self) -> int:
+        """ Returns the most guesses any answer needs """
+        return self._max_guesses
+
+    def next_guess(
+            self, history: tuple[tuple[str, str], ...]) -> Optional[str]:
+        """ Returns the guess the tree plays after history
+
+        Parameters:
+        history (tuple[tuple[str,str],...]): Tuple with guess words and squares
+
+        Returns:
+        str: the next guess, or None if history left the tree
+        """
+        offset = 0
+        for guess, squares in history:
+            index, count = NODE.unpack_from(self._data, HEADER.size + offset)
+            if self._vocab[index] != guess:
+                return None
+            offset = self._find_child(offset, count, encode_pattern(squares))
+            if offset is None:
+                return None
+        index, _ = NODE.unpack_from(self._data, HEADER.size + offset)
+        return self._vocab[index]
+
+    def _find_child(self, offset: int, count: int, code: int) -> Optional[int]:
+        """ Returns the offset of the child for code, or None """
+        start = HEADER.size + offset + NODE.size
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            child_code, child = CHILD.unpack_from(
+                self._data, start + middle * CHILD.size
+            )
+            if child_code == code:
+                return child
+            if child_code < code:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+
+def main():
+    """ Builds, verifies and stores the tree for vocab.txt and answers.txt """
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    vocab = load_words(VOCAB_FILE)
+    answers = load_words(ANSWERS_FILE)
+    start = time.perf_counter()
+    tree = build_tree(vocab, answers, workers)
+    counts = TreeBuilder(vocab, answers).guess_counts(tree)
+    path = tree_path(vocab, answers)
+    save_tree(tree, path, words_hash(vocab, answers), max(counts))
+    # The checkpoints are only needed until the tree is saved
+    shutil.rmtree(checkpoint_path(vocab, answers), ignore_errors=True)
+    print(f'Built in {time.perf_counter() - start:.1f}s, root guess '
+          f'{vocab[tree[0]]}')
+    print(f'Every answer solved in at most {max(counts)} guesses, '
+          f'{sum(counts) / len(counts):.3f} on average')
+    print(f'Saved to {path} ({os.path.getsize(path)} bytes)')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Wordle dictionaries
+A vocab and answers file pair split by word length. The words, indexes and
+feedback matrix of each length are only loaded or built the first time a game
+of that length needs them, so mixing word lengths only costs the lengths used.
+"""
+
+from typing import TYPE_CHECKING
+
+from a1_support import VOCAB_FILE, ANSWERS_FILE
+from vocabulary import Vocabulary
+from wordcache import load_shard
+
+if TYPE_CHECKING:
+    from feedback import FeedbackMatrix
+
+
+WORD_LENGTH = 6
+# Word lengths a game can be played with
+MIN_LENGTH = 4
+MAX_LENGTH = 8
+
+
+def check_length(length: int) -> None:
+    """ Raises ValueError unless games can be played with words of length """
+    if not MIN_LENGTH <= length <= MAX_LENGTH:
+        raise ValueError(
+            f'Word length must be from {MIN_LENGTH} to {MAX_LENGTH}'
+        )
+
+
+class Dictionary:
+    """ Words that can be guessed and answered, sharded by length
+
+    Each length is read from its own compiled shard of the word list files
+    (see wordcache.load_shard) and kept once loaded. Only lengths from
+    MIN_LENGTH to MAX_LENGTH can be loaded, so at most that many are kept.
+    """
+
+    def __init__(
+            self, vocab_file: str = VOCAB_FILE,
+            answers_file: str = ANSWERS_FILE) -> None:
+        """ Prepares a dictionary without loading any words
+
+        Parameters:
+        vocab_file (str): word list of the words that can be guessed
+        answers_file (str): word list of the words that can be the answer
+        """
+        self._vocab_file = vocab_file
+        self._answers_file = answers_file
+        # length -> Vocabulary
+        self._vocab = {}
+        self._answers = {}
+        # length -> FeedbackMatrix
+        self._matrices = {}
+
+    def get_loaded(self) -> tuple[int, ...]:
+        """ Returns the word lengths loaded so far, in increasing order """
+        return tuple(sorted(self._vocab.keys() | self._answers.keys()))
+
+    def get_vocab(self, length: int = WORD_LENGTH) -> Vocabulary:
+        """ Returns the words of length that can be guessed
+
+        Parameters:
+        length (int): number of letters in each word
+
+        Returns:
+        Vocabulary: the words, empty if the vocab has none of that length
+
+        Raises:
+        ValueError: if length is outside MIN_LENGTH to MAX_LENGTH
+        """
+        check_length(length)
+        if length not in self._vocab:
+            self._vocab[length] = Vocabulary(
+                load_shard(self._vocab_file, length)
+            )
+        return self._vocab[length]
+
+    def get_answers(self, length: int = WORD_LENGTH) -> Vocabulary:
+        """ Returns the words of length that can be the answer
+
+        Parameters:
+        length (int): number of letters in each word
+
+        Returns:
+        Vocabulary: the words, empty if the answers have none of that length
+
+        Raises:
+        ValueError: if length is outside MIN_LENGTH to MAX_LENGTH
+        """
+        check_length(length)
+        if length not in self._answers:
+            self._answers[length] = Vocabulary(
+                load_shard(self._answers_file, length)
+            )
+        return self._answers[length]
+
+    def get_matrix(self, length: int = WORD_LENGTH) -> 'FeedbackMatrix':
+        """ Returns the feedback matrix of the vocab against the answers
+
+        Parameters:
+        length (int): number of letters in each word
+
+        Returns:
+        FeedbackMatrix: the matrix, built the first time a length is used
+        """
+        # Imported here as it needs NumPy, which the words alone don't
+        from feedback import FeedbackMatrix
+        if length not in self._matrices:
+            self._matrices[length] = FeedbackMatrix(
+                self.get_vocab(length), self.get_answers(length)
+            )
+        return self._matrices[length]
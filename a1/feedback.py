@@ -0,0 +1,243 @@
+"""
+Wordle feedback matrix
+Grades whole batches of encoded words with NumPy and precomputes the feedback
+pattern of every (guess, answer) pair so analysis code can look patterns up
+instead of calling process_guess repeatedly.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from patterns import POWERS
+from wordcache import CACHE_DIR
+
+
+PATTERN_DTYPE = np.uint16
+LETTER_DTYPE = np.uint8
+# Upper bound on the (guesses, answers, letters, letters) comparison arrays
+# built by grade_matrix, which keeps each block to a few megabytes
+BLOCK_SIZE = 1 << 22
+# The version is bumped whenever grade changes so stale matrices are rebuilt
+MATRIX_FILE = 'feedback-v2-{}.u16'
+
+
+def encode_words(words: tuple[str, ...]) -> np.ndarray:
+    """ Encodes words as an array of letter codes
+
+    Letters are stored as uint8 codes with 'a' as 0 and 'z' as 25.
+
+    Parameters:
+    words (tuple[str, ...]): lowercase words, all the same length
+
+    Returns:
+    np.ndarray: array of shape (number of words, word length)
+    """
+    length = len(words[0]) if words else 0
+    letters = np.frombuffer(''.join(words).encode('ascii'), dtype=LETTER_DTYPE)
+    return (letters - ord('a')).reshape(len(words), length)
+
+
+def _as_encoded(words) -> np.ndarray:
+    """ Returns words as encoded letters, encoding strings if needed """
+    if isinstance(words, str):
+        return encode_words((words,))[0]
+    if isinstance(words, np.ndarray):
+        return words
+    return encode_words(tuple(words))
+
+
+def _grade_block(guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """ Grades every encoded guess against every encoded answer
+
+    Mirrors patterns.grade: a guess letter is yellow when fewer earlier
+    non-green copies of it appear in the guess than there are non-green
+    copies of it in the answer.
+
+    Parameters:
+    guesses (np.ndarray): encoded guesses of shape (M, L)
+    answers (np.ndarray): encoded answers of shape (N, L)
+
+    Returns:
+    np.ndarray: pattern codes of shape (M, N)
+    """
+    length = guesses.shape[1]
+    greens = guesses[:, None, :] == answers[None, :, :]
+    not_green = ~greens
+    # available[m, n, i]: copies of guess letter i among the answer's
+    # letters that were not matched by a green
+    matches = guesses[:, None, :, None] == answers[None, :, None, :]
+    available = (matches & not_green[:, :, None, :]).sum(axis=3)
+    # earlier[m, i, j]: guess letter j is an earlier copy of guess letter i
+    earlier = (
+        (guesses[:, :, None] == guesses[:, None, :])
+        & np.tri(length, k=-1, dtype=bool)
+    )
+    used = np.einsum(
+        'mnj,mij->mni', not_green.astype(np.int8), earlier.astype(np.int8)
+    )
+    yellows = not_green & (used < available)
+    digits = greens.astype(PATTERN_DTYPE) * 2 + yellows
+    return digits @ np.array(POWERS[:length], dtype=PATTERN_DTYPE)
+
+
+def grade_many(guess, answers) -> np.ndarray:
+    """ Returns the pattern codes of one guess against many answers
+
+    Parameters:
+    guess (str | np.ndarray): the guess, as a word or its encoded letters
+    answers (np.ndarray | tuple[str, ...]): encoded answers of shape (N, L)
+                                            or a tuple of words
+
+    Returns:
+    np.ndarray: uint16 pattern codes of shape (N,)
+    """
+    return grade_matrix(_as_encoded(guess)[None, :], answers)[0]
+
+
+def grade_matrix(guesses, answers) -> np.ndarray:
+    """ Returns the pattern codes of every guess against every answer
+
+    Parameters:
+    guesses (np.ndarray | tuple[str, ...]): encoded guesses of shape (M, L)
+                                            or a tuple of words
+    answers (np.ndarray | tuple[str, ...]): encoded answers of shape (N, L)
+                                            or a tuple of words
+
+    Returns:
+    np.ndarray: uint16 pattern codes of shape (M, N)
+    """
+    guesses = _as_encoded(guesses)
+    answers = _as_encoded(answers)
+    result = np.empty((len(guesses), len(answers)), dtype=PATTERN_DTYPE)
+    if not len(guesses) or not len(answers):
+        return result
+    length = guesses.shape[1]
+    # Grades blocks of guesses so the comparison arrays stay bounded
+    step = max(1, BLOCK_SIZE // (len(answers) * length * length))
+    for start in range(0, len(guesses), step):
+        result[start:start + step] = _grade_block(
+            guesses[start:start + step], answers
+        )
+    return result
+
+
+def words_hash(*word_lists: tuple[str, ...]) -> str:
+    """ Returns a hash identifying the contents and order of word lists
+
+    Parameters:
+    word_lists (tuple[str, ...]): the word lists to hash, in order
+
+    Returns:
+    str: hex digest that changes whenever any of the word lists change
+    """
+    digest = hashlib.sha1()
+    for words in word_lists:
+        digest.update('\n'.join(words).encode())
+        # Separator so ('ab',), ('c',) and ('a',), ('bc',) differ
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class FeedbackMatrix:
+    """ Pattern codes for every guess against every answer
+
+    Row i holds the patterns of guesses[i] against every answer and
+    column j holds the patterns of every guess against answers[j]. The
+    matrix is stored on disk as raw uint16 values and memory-mapped, so it
+    is only computed the first time a pair of word lists is seen.
+    """
+
+    def __init__(
+            self, guesses: tuple[str, ...], answers: tuple[str, ...],
+            cache_dir: str = CACHE_DIR) -> None:
+        """ Loads the matrix for guesses and answers, building it if needed
+
+        Parameters:
+        guesses (tuple[str, ...]): words that can be guessed (vocab)
+        answers (tuple[str, ...]): words that can be the answer
+        cache_dir (str): directory the matrix file is stored in
+        """
+        self._guesses = tuple(guesses)
+        self._answers = tuple(answers)
+        self._guess_index = {word: i for i, word in enumerate(self._guesses)}
+        self._answer_index = {word: i for i, word in enumerate(self._answers)}
+        self._path = os.path.join(
+            cache_dir,
+            MATRIX_FILE.format(words_hash(self._guesses, self._answers))
+        )
+        if not os.path.exists(self._path):
+            self._build(cache_dir)
+        self._matrix = np.memmap(
+            self._path, dtype=PATTERN_DTYPE, mode='r', shape=self.get_shape()
+        )
+
+    def get_shape(self) -> tuple[int, int]:
+        """ Returns (number of guesses, number of answers) """
+        return len(self._guesses), len(self._answers)
+
+    def get_path(self) -> str:
+        """ Returns the path of the file the matrix is stored in """
+        return self._path
+
+    def get_guesses(self) -> tuple[str, ...]:
+        """ Returns the guess words, in row order """
+        return self._guesses
+
+    def get_answers(self) -> tuple[str, ...]:
+        """ Returns the answer words, in column order """
+        return self._answers
+
+    def guess_index(self, guess: str) -> int:
+        """ Returns the row number of guess """
+        return self._guess_index[guess]
+
+    def answer_index(self, answer: str) -> int:
+        """ Returns the column number of answer """
+        return self._answer_index[answer]
+
+    def lookup(self, guess: str, answer: str) -> int:
+        """ Returns the pattern code of guess against answer
+
+        Parameters:
+        guess (str): a word from the guess list
+        answer (str): a word from the answer list
+
+        Returns:
+        int: pattern code of guess against answer
+        """
+        return int(
+            self._matrix[self._guess_index[guess], self._answer_index[answer]]
+        )
+
+    def row(self, guess: str) -> np.ndarray:
+        """ Returns a read-only view of guess against every answer """
+        return self._matrix[self._guess_index[guess]]
+
+    def column(self, answer: str) -> np.ndarray:
+        """ Returns a read-only view of every guess against answer """
+        return self._matrix[:, self._answer_index[answer]]
+
+    def as_array(self) -> np.ndarray:
+        """ Returns a read-only view of the whole matrix """
+        return self._matrix
+
+    def _build(self, cache_dir: str) -> None:
+        """ Computes every pattern and writes the matrix file
+
+        The matrix is written to a temporary file first and renamed once
+        complete, so an interrupted build never leaves a partial matrix.
+
+        Parameters:
+        cache_dir (str): directory the matrix file is stored in
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f'{self._path}.{os.getpid()}.tmp'
+        matrix = np.memmap(
+            temp_path, dtype=PATTERN_DTYPE, mode='w+', shape=self.get_shape()
+        )
+        matrix[:] = grade_matrix(self._guesses, self._answers)
+        matrix.flush()
+        del matrix
+        os.replace(temp_path, self._path)
@@ -0,0 +1,230 @@
+"""
+Wordle hints
+Gives the best hint that can be found within a fixed time budget, searching
+progressively deeper while there is time left.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from constraints import HardModeRules
+from decision_tree import DecisionTree
+from feedback import encode_words
+from opening_book import OpeningBook
+from solver import Solver, partition_sizes, entropy_scores
+
+
+# Search tiers, from cheapest to most thorough
+TREE = 'tree'
+BOOK = 'book'
+FREQUENCY = 'frequency'
+SAMPLED = 'sampled'
+FULL = 'full'
+DEFAULT_BUDGET = 0.05
+# Candidates used by the sampled entropy tier
+SAMPLE_SIZE = 48
+# Best guesses by letter frequency scored by the sampled entropy tier
+SHORTLIST_SIZE = 1500
+# Guesses scored at a time, the deadline is checked between chunks
+CHUNK_SIZE = 1024
+# Added to the scores of possible answers so they win ties
+CANDIDATE_BONUS = 1e-9
+# Histories whose hints are kept
+HINT_CACHE_SIZE = 1024
+
+
+class HintEngine:
+    """ Suggests guesses within a latency budget
+
+    Each hint starts with letter-position frequency scoring, which is
+    always finished, then entropy over a sample of the candidates, then
+    entropy over every candidate. The best guess of the deepest finished
+    tier is returned. If a decision tree has been built, histories on the
+    tree are answered from it straight away, and so are the first two
+    guesses when an opening book has been built. Hints are cached for the
+    last HINT_CACHE_SIZE histories.
+    In hard mode only guesses the rules allow are suggested. The index of
+    which guesses are allowed takes longer to build than the budget, so it
+    is built with the engine when hard mode hints will be asked for.
+    """
+
+    def __init__(
+            self, vocab: tuple[str, ...], answers: tuple[str, ...],
+            budget: float = DEFAULT_BUDGET,
+            solver: Optional[Solver] = None, hard: bool = False) -> None:
+        """ Creates an engine over vocab and answers
+
+        Parameters:
+        vocab (tuple[str, ...]): words that can be guessed
+        answers (tuple[str, ...]): words that can be the answer
+        budget (float): seconds allowed per hint
+        solver (Solver): solver over vocab and answers, created if not given
+        hard (bool): whether hints will be given for hard mode games
+        """
+        self._solver = solver or Solver(vocab, answers)
+        if hard:
+            self._solver.get_index()
+        self._vocab = self._solver.get_matrix().get_guesses()
+        self._patterns = self._solver.get_patterns()
+        self._encoded = encode_words(self._vocab)
+        length = self._encoded.shape[1]
+        # first[g, p]: letter p of word g doesn't appear earlier in word g
+        self._first = np.ones(self._encoded.shape, dtype=bool)
+        for position in range(1, length):
+            self._first[:, position] = np.all(
+                self._encoded[:, position, None]
+                != self._encoded[:, :position], axis=1
+            )
+        self._answer_rows = np.array([
+            self._solver.get_matrix().guess_index(answer)
+            for answer in self._solver.get_matrix().get_answers()
+        ])
+        try:
+            self._tree = DecisionTree(vocab, answers)
+        except (OSError, ValueError):
+            # No tree has been built for these word lists
+            self._tree = None
+        # Read on the first hint
+        self._book = OpeningBook(vocab, answers)
+        self._random = np.random.default_rng(0)
+        self._budget = budget
+        # (history, hard) -> hint, least recently used first
+        self._cache = OrderedDict()
+
+    def get_budget(self) -> float:
+        """ Returns the seconds allowed per hint """
+        return self._budget
+
+    def set_budget(self, budget: float) -> None:
+        """ Changes the seconds allowed per hint and clears the cache
+
+        Parameters:
+        budget (float): seconds allowed per hint
+        """
+        self._budget = budget
+        self._cache.clear()
+
+    def hint(
+            self, history: tuple[tuple[str, str], ...],
+            rules: Optional[HardModeRules] = None) -> tuple[str, str]:
+        """ Returns the best guess found for history within the budget
+
+        Parameters:
+        history (tuple[tuple[str,str],...]): Tuple with guess words and squares
+        rules (HardModeRules): hard mode rules of the game, or None
+
+        Returns:
+        tuple[str, str]: the guess and the name of the tier it came from
+        """
+        key = tuple(history), rules is not None
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        else:
+            self._cache[key] = self._search(key[0], rules)
+            if len(self._cache) > HINT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return self._cache[key]
+
+    def _search(
+            self, history: tuple[tuple[str, str], ...],
+            rules: Optional[HardModeRules]) -> tuple[str, str]:
+        """ Runs the search tiers for history until the deadline """
+        deadline = time.perf_counter() + self._budget
+        if self._tree is not None:
+            guess = self._tree.next_guess(history)
+            if guess is not None and (
+                    rules is None or rules.violation(guess) is None):
+                return guess, TREE
+        guess = self._book.next_guess(history)
+        if guess is not None and (
+                rules is None or rules.violation(guess) is None):
+            return guess, BOOK
+
+        candidates = self._solver.candidate_indices(history)
+        if not len(candidates):
+            candidates = np.arange(self._patterns.shape[1])
+        frequency = self._frequency_scores(candidates)
+        is_candidate = np.zeros(len(self._vocab), dtype=bool)
+        is_candidate[self._answer_rows[candidates]] = True
+        bonus = is_candidate * CANDIDATE_BONUS
+        order = np.argsort(-(frequency + bonus), kind='stable')
+        if rules is not None:
+            order = order[self._solver.legal_mask(rules)[order]]
+        best, tier = order[0], FREQUENCY
+        if len(candidates) <= 2:
+            # Guessing a candidate is as good as any split of two words, and
+            # candidates always follow the hard mode rules
+            return self._vocab[self._answer_rows[candidates[0]]], FREQUENCY
+
+        if len(candidates) > SAMPLE_SIZE:
+            sample = self._random.choice(
+                candidates, SAMPLE_SIZE, replace=False
+            )
+            sampled = self._entropy_best(
+                order[:SHORTLIST_SIZE], sample, bonus, deadline
+            )
+            if sampled is None:
+                return self._vocab[best], tier
+            best, tier = sampled, SAMPLED
+
+        # Most promising guesses first, though every guess is scored
+        full = self._entropy_best(order, candidates, bonus, deadline)
+        if full is not None:
+            best, tier = full, FULL
+        return self._vocab[best], tier
+
+    def _frequency_scores(self, candidates: np.ndarray) -> np.ndarray:
+        """ Scores guesses by how common their letters are in candidates
+
+        A guess scores the number of candidates with each of its letters
+        in the same position, plus the number containing each of its
+        distinct letters anywhere.
+        """
+        letters = self._encoded[self._answer_rows[candidates]]
+        length = letters.shape[1]
+        by_position = np.stack([
+            np.bincount(letters[:, position], minlength=26)
+            for position in range(length)
+        ])
+        present = np.zeros((len(letters), 26), dtype=bool)
+        present[np.arange(len(letters))[:, None], letters] = True
+        anywhere = present.sum(axis=0)
+        positional = by_position[np.arange(length), self._encoded].sum(axis=1)
+        distinct = (anywhere[self._encoded] * self._first).sum(axis=1)
+        return (positional + distinct).astype(float)
+
+    def _entropy_best(
+            self, guesses: np.ndarray, candidates: np.ndarray,
+            bonus: np.ndarray, deadline: float) -> Optional[int]:
+        """ Returns the guess with the most information about candidates
+
+        Parameters:
+        guesses (np.ndarray): vocab indices of the guesses to score
+        candidates (np.ndarray): answer indices to split
+        bonus (np.ndarray): tie break added to each vocab word's score
+        deadline (float): perf_counter time to give up at
+
+        Returns:
+        int: vocab index of the best guess, or None if time ran out
+        """
+        best, best_score = None, -np.inf
+        # A chunk isn't started unless one as slow as the last would finish
+        last = 0.0
+        for start in range(0, len(guesses), CHUNK_SIZE):
+            started = time.perf_counter()
+            if started + last >= deadline:
+                return None
+            chunk = guesses[start:start + CHUNK_SIZE]
+            patterns = self._patterns[chunk][:, candidates]
+            rows, sizes = partition_sizes(patterns)
+            scores = entropy_scores(
+                rows, sizes, len(chunk), len(candidates)
+            ) + bonus[chunk]
+            top = int(np.argmax(scores))
+            if scores[top] > best_score:
+                best, best_score = int(chunk[top]), scores[top]
+            last = time.perf_counter() - started
+        return best
@@ -0,0 +1,201 @@
+"""
+Word list ingestion
+Streams a large dictionary dump through a pipeline of generators, keeping
+only distinct words of the right length and alphabet, and writes them out as
+a word list along with its compiled form.
+"""
+
+import hashlib
+import os
+import sys
+import time
+from itertools import islice
+from string import ascii_lowercase, whitespace
+from typing import Iterator
+
+from wordcache import CompiledWriter, compiled_path
+
+
+WORD_LENGTH = 6
+# Bytes read from the dump at a time
+BLOCK_SIZE = 1 << 22
+NEWLINE = b'\n'
+# Whitespace that can surround a word on its line
+SPACES = whitespace.replace('\n', '').encode('ascii')
+# Reasons a line can be rejected, in the order the filters are applied
+LENGTH = 'length'
+ALPHABET = 'alphabet'
+DUPLICATE = 'duplicate'
+
+
+def read_blocks(
+        filename: str, block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """ Yields a file in blocks that end on a line boundary
+
+    Only one block of the file is held in memory at a time.
+
+    Parameters:
+    filename (str): path of the file to read
+    block_size (int): bytes read at a time
+
+    Yields:
+    bytes: the next block of whole lines
+    """
+    with open(filename, 'rb') as file:
+        partial = b''
+        for block in iter(lambda: file.read(block_size), b''):
+            end = block.rfind(NEWLINE) + 1
+            if not end:
+                # A line longer than a block, keep reading
+                partial += block
+                continue
+            yield partial + block[:end]
+            partial = block[end:]
+        if partial:
+            yield partial + NEWLINE
+
+
+def normalise(blocks: Iterator[bytes]) -> Iterator[list[bytes]]:
+    """ Splits blocks into lowercase lines without surrounding whitespace
+
+    Blocks are lowercased whole, and lines are only stripped one at a time
+    if the block has whitespace other than newlines.
+    """
+    for block in blocks:
+        block = block.lower().replace(b'\r\n', NEWLINE)
+        # The terminating newline leaves an empty string after the last line
+        lines = block.split(NEWLINE)[:-1]
+        if len(block.translate(None, SPACES)) != len(block):
+            lines = [line.strip() for line in lines]
+        yield lines
+
+
+def filter_words(
+        batches: Iterator[list[bytes]], counts: dict[str, int],
+        length: int = WORD_LENGTH,
+        alphabet: str = ascii_lowercase) -> Iterator[list[bytes]]:
+    """ Keeps the words of the given length made only of alphabet
+
+    Parameters:
+    batches (Iterator[list[bytes]]): batches of normalised lines
+    counts (dict[str, int]): rejected counts, updated for each reason
+    length (int): length of the words to keep
+    alphabet (str): letters words may contain
+
+    Yields:
+    list[bytes]: the words of each batch that passed the filters
+    """
+    letters = alphabet.encode('ascii')
+    for lines in batches:
+        sized = [line for line in lines if len(line) == length]
+        counts[LENGTH] += len(lines) - len(sized)
+        # Deleting every allowed letter leaves nothing of a valid word,
+        # so most batches are checked in one call
+        if NEWLINE.join(sized).translate(None, letters + NEWLINE):
+            words = [word for word in sized
+                     if not word.translate(None, letters)]
+        else:
+            words = sized
+        counts[ALPHABET] += len(sized) - len(words)
+        yield words
+
+
+def dedupe(
+        batches: Iterator[list[bytes]],
+        counts: dict[str, int]) -> Iterator[list[bytes]]:
+    """ Drops words that have been seen before, keeping the first
+
+    Memory grows with the number of distinct words kept, not the number of
+    lines read.
+
+    Parameters:
+    batches (Iterator[list[bytes]]): batches of filtered words
+    counts (dict[str, int]): rejected counts, updated for duplicates
+
+    Yields:
+    list[bytes]: the words of each batch that weren't seen before
+    """
+    # Dicts keep insertion order, so new words are the keys added last
+    seen = {}
+    for words in batches:
+        before = len(seen)
+        seen.update(dict.fromkeys(words))
+        fresh = list(islice(seen, before, None))
+        counts[DUPLICATE] += len(words) - len(fresh)
+        yield fresh
+
+
+def ingest(
+        source: str, destination: str, length: int = WORD_LENGTH,
+        alphabet: str = ascii_lowercase) -> dict:
+    """ Writes the valid words of source to a word list at destination
+
+    The word list is written with one word per line along with its compiled
+    form, so it loads without being parsed.
+
+    Parameters:
+    source (str): path of the dictionary dump, one entry per line
+    destination (str): path of the word list to write
+    length (int): length of the words to keep
+    alphabet (str): letters words may contain
+
+    Returns:
+    dict: lines read, words accepted, rejected counts by reason, seconds
+          taken and megabytes read per second
+    """
+    start = time.perf_counter()
+    counts = dict.fromkeys((LENGTH, ALPHABET, DUPLICATE), 0)
+    words = dedupe(
+        filter_words(normalise(read_blocks(source)), counts, length, alphabet),
+        counts
+    )
+    writer = CompiledWriter(compiled_path(destination), length)
+    digest = hashlib.sha1()
+    temp_path = f'{destination}.{os.getpid()}.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            for batch in words:
+                if batch:
+                    text = NEWLINE.join(batch) + NEWLINE
+                    file.write(text)
+                    digest.update(text)
+                    writer.write(batch)
+        os.replace(temp_path, destination)
+    except BaseException:
+        writer.abort()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    written = os.stat(destination)
+    writer.finish(written.st_mtime_ns, written.st_size, digest.digest())
+    seconds = time.perf_counter() - start
+    accepted = writer.get_count()
+    return {
+        'lines': accepted + sum(counts.values()),
+        'accepted': accepted,
+        'rejected': counts,
+        'seconds': seconds,
+        'mb_per_second': os.path.getsize(source) / 1e6 / seconds,
+    }
+
+
+def print_report(report: dict) -> None:
+    """ Prints the counts and speed of an ingestion
+
+    Parameters:
+    report (dict): report returned by ingest
+    """
+    print('Lines read: ' + str(report['lines']))
+    print('Words accepted: ' + str(report['accepted']))
+    for reason, count in report['rejected'].items():
+        print('Rejected (' + reason + '): ' + str(count))
+    print(f"Took {report['seconds']:.2f}s "
+          f"({report['mb_per_second']:.1f} MB/s)")
+
+
+if __name__ == '__main__':
+    # python ingest.py source destination [length]
+    if len(sys.argv) not in (3, 4):
+        sys.exit('Usage: python ingest.py source destination [length]')
+    length = int(sys.argv[3]) if len(sys.argv) == 4 else WORD_LENGTH
+    print_report(ingest(sys.argv[1], sys.argv[2], length))
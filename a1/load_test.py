@@ -0,0 +1,121 @@
+"""
+Wordle server load test
+Simulates many players connected to a running server at once, each playing
+games with random guesses, and reports the round trip latency of guesses.
+
+Run from the a1 directory: python load_test.py [players] [games] [address]
+"""
+
+import asyncio
+import sys
+import time
+from random import Random
+
+from a1_support import load_words, ANSWERS_FILE
+from server import HOST, PORT, ENCODING, percentiles
+
+
+PLAYERS = 1000
+GAMES = 5
+
+
+async def connect(
+        address: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """ Opens a connection to the server at address
+
+    Parameters:
+    address (str): TCP port on localhost, or the path of a Unix socket
+    """
+    if address.isdigit():
+        return await asyncio.open_connection(HOST, int(address))
+    return await asyncio.open_unix_connection(address)
+
+
+async def play(
+        address: str, games: int, words: tuple[str, ...],
+        seed: int) -> list[float]:
+    """ Plays games on one connection and returns each guess's latency
+
+    Parameters:
+    address (str): TCP port on localhost, or the path of a Unix socket
+    games (int): number of games to finish
+    words (tuple[str, ...]): words to guess from
+    seed (int): seed for the player's guesses
+
+    Returns:
+    list[float]: round trip time in seconds of every guess
+    """
+    random = Random(seed)
+    reader, writer = await connect(address)
+    latencies = []
+    finished = 0
+    try:
+        while finished < games:
+            start = time.perf_counter()
+            writer.write(f'GUESS {random.choice(words)}\n'.encode(ENCODING))
+            await writer.drain()
+            response = (await reader.readline()).decode(ENCODING).split()
+            latencies.append(time.perf_counter() - start)
+            if not response or response[0] != 'RESULT':
+                raise ConnectionError('Unexpected response: '
+                                      + ' '.join(response))
+            if response[2] != 'PLAYING':
+                finished += 1
+        writer.write(b'QUIT\n')
+        await reader.readline()
+    finally:
+        writer.close()
+    return latencies
+
+
+async def load_test(
+        address: str = str(PORT), players: int = PLAYERS,
+        games: int = GAMES) -> dict:
+    """ Runs players concurrent connections against the server at address
+
+    Parameters:
+    address (str): TCP port on localhost, or the path of a Unix socket
+    players (int): number of simultaneous connections
+    games (int): games each player finishes
+
+    Returns:
+    dict: number of players and guesses, seconds taken, guesses per second
+          and the p50, p90 and p99 round trip latencies in seconds
+    """
+    words = load_words(ANSWERS_FILE)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        play(address, games, words, seed) for seed in range(players)
+    ))
+    seconds = time.perf_counter() - start
+    latencies = [latency for result in results for latency in result]
+    p50, p90, p99 = percentiles(latencies)
+    return {
+        'players': players,
+        'guesses': len(latencies),
+        'seconds': seconds,
+        'guesses_per_second': len(latencies) / seconds,
+        'p50': p50,
+        'p90': p90,
+        'p99': p99,
+    }
+
+
+def print_report(report: dict) -> None:
+    """ Prints the results of a load test
+
+    Parameters:
+    report (dict): report returned by load_test
+    """
+    print(f"{report['players']} players made {report['guesses']} guesses "
+          f"in {report['seconds']:.2f}s "
+          f"({report['guesses_per_second']:.0f} guesses/s)")
+    print(f"Round trip: p50 {report['p50'] * 1000:.3f}ms "
+          f"p90 {report['p90'] * 1000:.3f}ms p99 {report['p99'] * 1000:.3f}ms")
+
+
+if __name__ == '__main__':
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else PLAYERS
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else GAMES
+    address = sys.argv[3] if len(sys.argv) > 3 else str(PORT)
+    print_report(asyncio.run(load_test(address, players, games)))
@@ -0,0 +1,86 @@
+"""
+Multi-board Wordle
+Several hidden answers played at once, with every guess graded against all
+unsolved boards in a single batched call.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from feedback import encode_words, grade_many
+from patterns import decode_pattern, winning_code
+
+
+class MultiBoardGame:
+    """ A game with one hidden answer and one history per board
+
+    Solved boards stop receiving guesses, so each guess is only graded
+    against the boards that are still unsolved.
+    """
+
+    def __init__(self, answers: tuple[str, ...]) -> None:
+        """ Creates a game with a board for each answer
+
+        Parameters:
+        answers (tuple[str, ...]): the hidden answer of each board
+        """
+        self._answers = tuple(answers)
+        self._encoded = encode_words(self._answers)
+        self._histories = [[] for _ in self._answers]
+        # Guess number each board was solved on, None while unsolved
+        self._solved_at = [None] * len(self._answers)
+        self._unsolved = np.arange(len(self._answers))
+        self._guess_number = 0
+
+    def get_answers(self) -> tuple[str, ...]:
+        """ Returns the answer of each board """
+        return self._answers
+
+    def get_guess_number(self) -> int:
+        """ Returns the number of guesses made so far """
+        return self._guess_number
+
+    def get_history(self, board: int) -> tuple[tuple[str, str], ...]:
+        """ Returns the history of one board
+
+        Parameters:
+        board (int): index of the board
+
+        Returns:
+        tuple[tuple[str,str],...]: Tuple with guess words and squares
+        """
+        return tuple(self._histories[board])
+
+    def get_histories(self) -> tuple[tuple[tuple[str, str], ...], ...]:
+        """ Returns the history of every board """
+        return tuple(tuple(history) for history in self._histories)
+
+    def get_solved_at(self, board: int) -> Optional[int]:
+        """ Returns the guess number board was solved on, or None """
+        return self._solved_at[board]
+
+    def unsolved(self) -> tuple[int, ...]:
+        """ Returns the indices of the boards that haven't been solved """
+        return tuple(int(board) for board in self._unsolved)
+
+    def is_solved(self) -> bool:
+        """ Returns whether every board has been solved """
+        return not len(self._unsolved)
+
+    def guess(self, guess: str) -> None:
+        """ Grades guess against every unsolved board at once
+
+        Parameters:
+        guess (str): the users guess
+        """
+        self._guess_number += 1
+        codes = grade_many(guess, self._encoded[self._unsolved])
+        for board, code in zip(self._unsolved, codes):
+            self._histories[board].append(
+                (guess, decode_pattern(int(code), len(guess)))
+            )
+        solved = codes == winning_code(len(guess))
+        for board in self._unsolved[solved]:
+            self._solved_at[board] = self._guess_number
+        self._unsolved = self._unsolved[~solved]
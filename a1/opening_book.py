@@ -0,0 +1,248 @@
+"""
+Wordle opening book
+Precomputes the solver's first guess and its second guess after every
+feedback pattern of the first, when the candidate sets are largest and
+ranking is slowest, and stores them in a small table on disk.
+
+Run from the a1 directory: python opening_book.py [workers]
+"""
+
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from a1_support import load_words, VOCAB_FILE, ANSWERS_FILE
+from feedback import words_hash
+from patterns import decode_pattern, encode_pattern, winning_code
+from sharedmem import attach_feedback, publish_feedback
+from solver import Solver
+from wordcache import CACHE_DIR
+
+
+BOOK_FILE = 'book-{}.wob'
+MAGIC = b'WOB2'
+# magic, sha1 of the vocab and answers, vocab index of the first guess,
+# number of entries. Indexes are 32 bit so any vocab fits.
+HEADER = struct.Struct('<4s20sIH')
+# pattern code of the first guess, vocab index of the second guess
+ENTRY = struct.Struct('<HI')
+# Pattern codes sent to a worker at a time
+CHUNK_SIZE = 16
+
+# Solver used by the second guesses ranked in this worker process
+_worker_solver = None
+
+
+def book_path(
+        vocab: tuple[str, ...], answers: tuple[str, ...],
+        cache_dir: str = CACHE_DIR) -> str:
+    """ Returns where the opening book for vocab and answers is stored """
+    return os.path.join(
+        cache_dir, BOOK_FILE.format(words_hash(vocab, answers))
+    )
+
+
+def save_book(
+        first: int, seconds: dict[int, int], path: str,
+        digest: str) -> None:
+    """ Writes an opening book to path
+
+    Parameters:
+    first (int): vocab index of the first guess
+    seconds (dict[int, int]): vocab index of the second guess for each
+                              pattern code of the first guess
+    path (str): file to write
+    digest (str): words_hash of the vocab and answers the book is for
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(HEADER.pack(
+            MAGIC, bytes.fromhex(digest), first, len(seconds)
+        ))
+        for code in sorted(seconds):
+            file.write(ENTRY.pack(code, seconds[code]))
+    os.replace(temp_path, path)
+
+
+class OpeningBook:
+    """ The stored first and second guesses for a vocab and answers
+
+    The file isn't read until the first lookup. If no book has been built
+    for the word lists, every lookup returns None.
+    """
+
+    def __init__(
+            self, vocab: tuple[str, ...], answers: tuple[str, ...],
+            path: Optional[str] = None) -> None:
+        """ Prepares the book for vocab and answers without reading it
+
+        Parameters:
+        vocab (tuple[str, ...]): words that can be guessed
+        answers (tuple[str, ...]): words that can be the answer
+        path (str): book file, defaults to the one in the cache
+        """
+        self._vocab = tuple(vocab)
+        self._digest = words_hash(vocab, answers)
+        self._path = path or book_path(vocab, answers)
+        self._loaded = False
+        self._first = None
+        self._seconds = {}
+
+    def is_built(self) -> bool:
+        """ Returns whether a valid book exists for the word lists """
+        self._load()
+        return self._first is not None
+
+    def next_guess(
+            self, history: tuple[tuple[str, str], ...]) -> Optional[str]:
+        """ Returns the book guess after history
+
+        Parameters:
+        history (tuple[tuple[str,str],...]): Tuple with guess words and squares
+
+        Returns:
+        str: the next guess, or None if history is past or off the book
+        """
+        self._load()
+        if self._first is None or len(history) > 1:
+            return None
+        first = self._vocab[self._first]
+        if not history:
+            return first
+        guess, squares = history[0]
+        if guess != first:
+            return None
+        second = self._seconds.get(encode_pattern(squares))
+        return None if second is None else self._vocab[second]
+
+    def _load(self) -> None:
+        """ Reads the book the first time it is needed """
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self._path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return
+        if len(data) < HEADER.size:
+            return
+        magic, digest, first, count = HEADER.unpack_from(data)
+        if (magic != MAGIC or digest.hex() != self._digest
+                or len(data) != HEADER.size + count * ENTRY.size):
+            # Stale or foreign book, treated as missing
+            return
+        self._first = first
+        self._seconds = dict(ENTRY.iter_unpack(data[HEADER.size:]))
+
+
+def _init_worker(specs: dict) -> None:
+    """ Creates the solver used by a worker process """
+    global _worker_solver
+    matrix = attach_feedback(specs)
+    _worker_solver = Solver(matrix.get_guesses(), matrix.get_answers(),
+                            matrix=matrix)
+
+
+def _best_seconds(first: int, codes: list[int]) -> list[tuple[int, int]]:
+    """ Ranks the second guess for a shard of pattern codes
+
+    Returns:
+    list[tuple[int, int]]: (pattern code, vocab index of the second guess)
+    """
+    row = _worker_solver.get_patterns()[first]
+    return [
+        (code, _worker_solver.rank_candidates(
+            np.flatnonzero(row == code), 1)[0])
+        for code in codes
+    ]
+
+
+def build_book(
+        vocab: tuple[str, ...], answers: tuple[str, ...],
+        workers: Optional[int] = None) -> tuple[int, dict[int, int]]:
+    """ Computes the opening book, sharding second guesses over processes
+
+    Parameters:
+    vocab (tuple[str, ...]): words that can be guessed
+    answers (tuple[str, ...]): words that can be the answer
+    workers (int): number of worker processes, defaults to the CPU count
+
+    Returns:
+    tuple[int, dict[int, int]]: vocab index of the first guess and of the
+        second guess for each pattern code the first guess can give
+    """
+    solver = Solver(vocab, answers)
+    matrix = solver.get_matrix()
+    first = matrix.guess_index(solver.best_guess(()))
+    codes = [
+        int(code) for code in np.unique(solver.get_patterns()[first])
+        if code != winning_code(len(answers[0]))
+    ]
+    shards = [
+        codes[i:i + CHUNK_SIZE] for i in range(0, len(codes), CHUNK_SIZE)
+    ]
+    seconds = {}
+    with publish_feedback(matrix) as shared, ProcessPoolExecutor(
+            workers, initializer=_init_worker,
+            initargs=(shared.get_specs(),)) as executor:
+        for shard in executor.map(_best_seconds, [first] * len(shards),
+                                  shards):
+            seconds.update(shard)
+    return first, seconds
+
+
+def verify_book(
+        vocab: tuple[str, ...], answers: tuple[str, ...], first: int,
+        seconds: dict[int, int]) -> list[int]:
+    """ Compares a book with the guesses a fresh solver picks
+
+    Parameters:
+    vocab (tuple[str, ...]): words that can be guessed
+    answers (tuple[str, ...]): words that can be the answer
+    first (int): vocab index of the book's first guess
+    seconds (dict[int, int]): the book's second guesses by pattern code
+
+    Returns:
+    list[int]: pattern codes whose second guess differs, with -1 standing
+               for the first guess
+    """
+    solver = Solver(vocab, answers)
+    words = solver.get_matrix().get_guesses()
+    mismatches = []
+    if solver.best_guess(()) != words[first]:
+        mismatches.append(-1)
+    for code, second in sorted(seconds.items()):
+        history = ((words[first], decode_pattern(code, len(answers[0]))),)
+        if solver.best_guess(history) != words[second]:
+            mismatches.append(code)
+    return mismatches
+
+
+def main():
+    """ Builds, verifies and stores the book for vocab.txt and answers.txt """
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    vocab = load_words(VOCAB_FILE)
+    answers = load_words(ANSWERS_FILE)
+    start = time.perf_counter()
+    first, seconds = build_book(vocab, answers, workers)
+    built = time.perf_counter() - start
+    mismatches = verify_book(vocab, answers, first, seconds)
+    if mismatches:
+        sys.exit(f'Book differs from a fresh solver for pattern codes '
+                 f'{mismatches}, not saved')
+    path = book_path(vocab, answers)
+    save_book(first, seconds, path, words_hash(vocab, answers))
+    print(f'Built in {built:.1f}s, first guess {vocab[first]}, '
+          f'{len(seconds)} second guesses verified')
+    print(f'Saved to {path} ({os.path.getsize(path)} bytes)')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Packed words
+Stores each word as one integer with 5 bits per letter, so a six letter word
+fits in 30 bits and a word list fits in a flat array of uint32.
+"""
+
+from array import array
+
+import numpy as np
+
+from patterns import POWERS
+
+
+BITS_PER_LETTER = 5
+LETTER_MASK = (1 << BITS_PER_LETTER) - 1
+# Letters are stored as 'a' = 1 to 'z' = 26, leaving 0 for no letter
+LETTER_OFFSET = ord('a') - 1
+# Longest word that fits in 32 bits
+MAX_LENGTH = 32 // BITS_PER_LETTER
+WORD_LENGTH = 6
+# Shift of the letter at each position, the first letter is the lowest bits
+SHIFTS = tuple(BITS_PER_LETTER * i for i in range(MAX_LENGTH))
+PACKED_DTYPE = np.uint32
+# Typecode of an unsigned array item of at least 32 bits
+TYPECODE = 'I' if array('I').itemsize >= 4 else 'L'
+# Lowest bit, low four bits and highest bit of every letter of a packed word
+ONES = sum(1 << shift for shift in SHIFTS)
+LOW_BITS = ONES * (LETTER_MASK >> 1)
+HIGH_BITS = ONES << (BITS_PER_LETTER - 1)
+
+
+def pack(word: str) -> int:
+    """ Packs a word of at most MAX_LENGTH lowercase letters into an int
+
+    Parameters:
+    word (str): the word to pack
+
+    Returns:
+    int: the packed word, with the first letter in the lowest 5 bits
+    """
+    packed = 0
+    for char in reversed(word):
+        packed = (packed << BITS_PER_LETTER) | (ord(char) - LETTER_OFFSET)
+    return packed
+
+
+def unpack(packed: int) -> str:
+    """ Returns the word stored in a packed int
+
+    Parameters:
+    packed (int): a word packed by pack
+
+    Returns:
+    str: the unpacked word
+    """
+    chars = []
+    while packed:
+        chars.append(chr((packed & LETTER_MASK) + LETTER_OFFSET))
+        packed >>= BITS_PER_LETTER
+    return ''.join(chars)
+
+
+def letter_at(packed: int, position: int) -> int:
+    """ Returns the letter code at position of a packed word
+
+    Parameters:
+    packed (int): a word packed by pack
+    position (int): index of the letter, from 0
+
+    Returns:
+    int: the letter code, 'a' = 1 to 'z' = 26, or 0 past the end
+    """
+    return (packed >> SHIFTS[position]) & LETTER_MASK
+
+
+def pack_words(words: tuple[str, ...]) -> array:
+    """ Packs words into an array of unsigned 32 bit ints
+
+    Parameters:
+    words (tuple[str, ...]): words of at most MAX_LENGTH letters
+
+    Returns:
+    array: the packed words, in order
+    """
+    return array(TYPECODE, map(pack, words))
+
+
+def pack_array(words: tuple[str, ...]) -> np.ndarray:
+    """ Packs words of equal length into a uint32 NumPy array
+
+    Parameters:
+    words (tuple[str, ...]): lowercase words, all the same length
+
+    Returns:
+    np.ndarray: the packed words, of shape (number of words,)
+    """
+    length = len(words[0]) if words else 0
+    letters = np.frombuffer(
+        ''.join(words).encode('ascii'), dtype=np.uint8
+    ).reshape(len(words), length)
+    codes = (letters - LETTER_OFFSET).astype(PACKED_DTYPE)
+    shifts = np.array(SHIFTS[:length], dtype=PACKED_DTYPE)
+    return np.bitwise_or.reduce(codes << shifts, axis=1)
+
+
+def unpack_array(
+        packed: np.ndarray, length: int = WORD_LENGTH) -> np.ndarray:
+    """ Extracts the letters of packed words with shifts and masks
+
+    Parameters:
+    packed (np.ndarray): packed words of shape (N,)
+    length (int): number of letters in each word
+
+    Returns:
+    np.ndarray: uint8 letters of shape (N, length) with 'a' as 0, the same
+                encoding as feedback.encode_words
+    """
+    shifts = np.array(SHIFTS[:length], dtype=PACKED_DTYPE)
+    letters = (np.asarray(packed)[:, None] >> shifts) & LETTER_MASK
+    return (letters - 1).astype(np.uint8)
+
+
+def grade_packed(guess: int, answer: int, length: int = WORD_LENGTH) -> int:
+    """ Returns the pattern code of a packed guess against a packed answer
+
+    Gives the same code as patterns.grade on the unpacked words. Greens
+    are the positions where guess XOR answer has a zero letter.
+
+    Parameters:
+    guess (int): the packed guess
+    answer (int): the packed answer, the same length as guess
+    length (int): number of letters in each word
+
+    Returns:
+    int: the pattern code of the guess (see patterns.encode_pattern)
+    """
+    if guess == answer:
+        return POWERS[length] - 1
+    code = 0
+    difference = guess ^ answer
+    # Answer letters not matched by a green, each copy counted once
+    unmatched = []
+    misses = []
+    for i in range(length):
+        shift = SHIFTS[i]
+        if (difference >> shift) & LETTER_MASK:
+            unmatched.append((answer >> shift) & LETTER_MASK)
+            misses.append(i)
+        else:
+            code += 2 * POWERS[i]
+    for i in misses:
+        letter = (guess >> SHIFTS[i]) & LETTER_MASK
+        if letter in unmatched:
+            unmatched.remove(letter)
+            code += POWERS[i]
+    return code
+
+
+def zero_letters(packed: np.ndarray) -> np.ndarray:
+    """ Marks the zero letters of packed words without unpacking them
+
+    Adding the low four bits of a letter to 15 sets its highest bit unless
+    they are all zero, and never carries into the next letter, so only the
+    highest bits of zero letters are left clear.
+
+    Parameters:
+    packed (np.ndarray): uint32 packed words
+
+    Returns:
+    np.ndarray: the highest bit of each zero letter set, every other bit
+                clear
+    """
+    low = PACKED_DTYPE(LOW_BITS)
+    return ~(((packed & low) + low) | packed | low) & PACKED_DTYPE(HIGH_BITS)
+
+
+def grade_packed_many(
+        guess: int, answers: np.ndarray,
+        length: int = WORD_LENGTH) -> np.ndarray:
+    """ Returns the pattern codes of a packed guess against packed answers
+
+    Gives the same codes as feedback.grade_many on the unpacked words, but
+    works on whole packed answers. Greens are the zero letters of guess XOR
+    answer. A guess letter is yellow if the answer has more copies of it
+    outside the greens than the guess has before it outside the greens,
+    where copies are the zero letters of the answer XOR the letter repeated.
+
+    Parameters:
+    guess (int): the packed guess
+    answers (np.ndarray): packed answers of shape (N,)
+    length (int): number of letters in each word
+
+    Returns:
+    np.ndarray: uint16 pattern codes of shape (N,)
+    """
+    answers = np.asarray(answers, dtype=PACKED_DTYPE)
+    # Letters past length are zero in guesses and answers, so ignored
+    fields = HIGH_BITS & ((1 << SHIFTS[length]) - 1 if length < MAX_LENGTH
+                          else HIGH_BITS)
+    greens = zero_letters(answers ^ PACKED_DTYPE(guess)) & fields
+    # Answer letters not matched by a green
+    open_letters = ~greens & PACKED_DTYPE(fields)
+    letters = [letter_at(guess, i) for i in range(length)]
+    high_bits = [SHIFTS[i] + BITS_PER_LETTER - 1 for i in range(length)]
+    # Each row is one guess position, each column one answer
+    copies = zero_letters(
+        answers ^ np.array(letters, dtype=PACKED_DTYPE)[:, None] * ONES
+    )
+    available = np.bitwise_count(copies & open_letters)
+    # Earlier guess copies of each letter, counted outside the greens
+    earlier = np.array([
+        sum(1 << high_bits[j] for j in range(i) if letters[j] == letter)
+        for i, letter in enumerate(letters)
+    ], dtype=PACKED_DTYPE)
+    used = np.bitwise_count(open_letters & earlier[:, None])
+    is_green = (greens >> np.array(high_bits, dtype=PACKED_DTYPE)[:, None]) & 1
+    is_yellow = (available > used) & (is_green == 0)
+    squares = (2 * is_green + is_yellow).astype(np.uint16)
+    return np.array(POWERS[:length], dtype=np.uint16) @ squares
@@ -0,0 +1,94 @@
+"""
+Wordle feedback patterns
+Grades guesses as compact integer pattern codes and converts between pattern
+codes and their square representation.
+"""
+
+from functools import lru_cache
+
+from a1_support import CORRECT, MISPLACED, INCORRECT
+
+
+# Squares in order of their base-3 digit value
+SQUARES = (INCORRECT, MISPLACED, CORRECT)
+SQUARE_VALUES = {square: value for value, square in enumerate(SQUARES)}
+PATTERN_BASE = 3
+# Place value of each letter position in a pattern code
+POWERS = tuple(PATTERN_BASE ** i for i in range(16))
+
+
+def grade(guess: str, answer: str) -> int:
+    """ Returns the pattern code of guess against answer
+
+    The first pass marks letters in the right position and collects the
+    answer letters left unmatched. The second pass marks a letter as
+    misplaced only while an unmatched copy of it remains, so a repeated
+    letter is yellow at most as many times as it appears in the answer.
+
+    Parameters:
+    guess (str): the users guess
+    answer (str): answer to the wordle game, the same length as guess
+
+    Returns:
+    int: the pattern code of the guess (see encode_pattern)
+    """
+    if guess == answer:
+        return POWERS[len(guess)] - 1
+    code = 0
+    # Answer letters not matched by a green, each copy counted once
+    unmatched = ''
+    misses = []
+    for i in range(len(guess)):
+        if guess[i] == answer[i]:
+            code += 2 * POWERS[i]
+        else:
+            unmatched += answer[i]
+            misses.append(i)
+    for i in misses:
+        char = guess[i]
+        if char in unmatched:
+            unmatched = unmatched.replace(char, '', 1)
+            code += POWERS[i]
+    return code
+
+
+def encode_pattern(squares: str) -> int:
+    """ Converts a square representation into an integer pattern code
+
+    Each square is a base-3 digit (black 0, yellow 1, green 2) with the
+    first letter of the guess being the least significant digit. A six
+    letter pattern is at most 3**6 - 1 = 728, so it fits in a uint16.
+
+    Parameters:
+    squares (str): square representation returned by process_guess
+
+    Returns:
+    int: the pattern code for squares
+    """
+    code = 0
+    for square in reversed(squares):
+        code = code * PATTERN_BASE + SQUARE_VALUES[square]
+    return code
+
+
+@lru_cache(maxsize=None)
+def decode_pattern(code: int, length: int = 6) -> str:
+    """ Converts an integer pattern code back into its squares
+
+    Parameters:
+    code (int): pattern code made by grade or encode_pattern
+    length (int): number of letters in the guess
+
+    Returns:
+    str: the square representation of code
+    """
+    squares = []
+    for _ in range(length):
+        code, value = divmod(code, PATTERN_BASE)
+        squares.append(SQUARES[value])
+    return ''.join(squares)
+
+
+def winning_code(length: int = 6) -> int:
+    """ Returns the pattern code of a guess that matches the answer """
+    return POWERS[length] - 1
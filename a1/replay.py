@@ -0,0 +1,509 @@
+"""
+Wordle transcript replay
+Parses transcripts of classic games, plays them again headlessly through the
+game's own functions with each answer inferred from the transcript, and diffs
+the output with the original. Large batches of transcripts are replayed by a
+process pool, and random transcripts can be generated by driving main.
+
+Run from the a1 directory:
+    python replay.py [hard] <transcript or directory> ... [workers]
+    python replay.py generate [hard] <count> <directory> [games] [workers]
+"""
+
+import difflib
+import io
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from random import Random
+from typing import Optional
+
+import a1
+from a1_support import load_words, VOCAB_FILE, ANSWERS_FILE
+from answer_pool import AnswerPool
+from constraints import ConstraintIndex, HardModeRules
+
+
+# Kinds of step a typed input can lead to
+GUESS = 'guess'
+INVALID = 'invalid'
+KEYBOARD = 'keyboard'
+HINT = 'hint'
+QUIT = 'quit'
+
+PROMPT = re.compile(r'Enter guess (\d+): (.*)')
+WON = 'Correct! You won in '
+LOST = 'You lose! The answer was: '
+PLAY_AGAIN = 'Would you like to play again (y/n)? '
+# Command line option for transcripts of hard mode games
+HARD = 'hard'
+TRANSCRIPT_SUFFIX = '.txt'
+# Transcripts sent to a worker at a time
+CHUNK_SIZE = 16
+# Lines of the first failing diffs printed by the command line
+DIFF_LINES = 40
+
+# Chances of each kind of input typed by a generated player
+KEYBOARD_CHANCE = 0.05
+INVALID_CHANCE = 0.05
+# Chance a generated player guesses the answer once it is a candidate
+SOLVE_CHANCE = 0.5
+
+# Word lists used by the transcripts replayed in this worker process
+_worker_words = None
+
+
+def _last_row(block: list[str]) -> tuple[str, str]:
+    """ Returns the newest guess and squares in a print_history block """
+    rows = [i for i, line in enumerate(block) if line.startswith('Guess ')]
+    row = rows[-1]
+    word = ''.join(block[row].split(':', 1)[1].split())
+    return word, block[row + 1].strip()
+
+
+def parse_transcript(text: str) -> list[dict]:
+    """ Splits a transcript into the games played and the steps of each
+
+    Each step is one typed input and what it led to, as (typed, kind, value)
+    where value is the word and squares printed for a guess and the line
+    printed for a hint. The word played is read from the printed history,
+    so transcripts of drivers that type something other than the guess
+    still replay.
+
+    Parameters:
+    text (str): everything printed during the session, inputs included
+
+    Returns:
+    list[dict]: each game's steps, answer (None if the game was quit before
+                the transcript shows it) and answer to play_again (None if
+                the game was never finished)
+    """
+    games = []
+    game = {'steps': [], 'answer': None, 'again': None}
+    lines = text.split('\n')
+    i = 0
+    while i < len(lines):
+        prompt = PROMPT.fullmatch(lines[i])
+        i += 1
+        if prompt is None:
+            line = lines[i - 1]
+            if line.startswith(LOST):
+                game['answer'] = line[len(LOST):]
+            elif line.startswith(WON):
+                game['answer'] = game['steps'][-1][2][0]
+            elif line.startswith(PLAY_AGAIN):
+                game['again'] = line[len(PLAY_AGAIN):]
+                games.append(game)
+                game = {'steps': [], 'answer': None, 'again': None}
+            continue
+        typed = prompt.group(2)
+        start = i
+        while i < len(lines) and not (
+                PROMPT.fullmatch(lines[i]) or lines[i].startswith(WON)
+                or lines[i].startswith(LOST)):
+            i += 1
+        block = lines[start:i]
+        if typed.lower() == 'q':
+            game['steps'].append((typed, QUIT, None))
+            break
+        if block and block[0].startswith('-'):
+            game['steps'].append((typed, GUESS, _last_row(block)))
+        elif block and block[0].startswith('Invalid!'):
+            game['steps'].append((typed, INVALID, None))
+        elif block and block[0].startswith('Ah, you need help?'):
+            game['steps'].append((typed, HINT, block[0]))
+        else:
+            game['steps'].append((typed, KEYBOARD, None))
+    if game['steps']:
+        games.append(game)
+    return games
+
+
+def infer_answer(
+        history: tuple[tuple[str, str], ...],
+        answers: tuple[str, ...]) -> Optional[str]:
+    """ Returns an answer that gives the squares in history
+
+    Used for games the transcript doesn't reveal the answer of. Any answer
+    consistent with every guess prints the same history and keyboard.
+
+    Parameters:
+    history (tuple[tuple[str,str],...]): Tuple with guess words and squares
+    answers (tuple[str, ...]): words that can be the answer
+
+    Returns:
+    str: the first consistent answer, or None if there is none
+    """
+    candidates = ConstraintIndex(answers).candidates(history)
+    return candidates[0] if candidates else None
+
+
+def replay(
+        text: str, vocab: tuple[str, ...], answers: tuple[str, ...],
+        hard: bool = False) -> str:
+    """ Plays a transcript again and returns what the game prints
+
+    Inputs go through prompt_user, guesses through update_history (and so
+    process_guess) and print_history, 'k' through print_keyboard and the
+    end of each game through update_stats and print_stats. Hints depend on
+    the search time budget, so their lines are copied from the transcript.
+
+    Parameters:
+    text (str): the transcript to replay
+    vocab (tuple[str, ...]): words that can be guessed
+    answers (tuple[str, ...]): words that can be the answer
+    hard (bool): whether the transcript was played in hard mode
+
+    Returns:
+    str: the replayed transcript, equal to text if nothing has changed
+    """
+    games = parse_transcript(text)
+    stats = (0,) * 7
+    output = io.StringIO()
+
+    def typed(prompt: str) -> str:
+        """ Echoes prompt and the next input like a terminal would """
+        entry, played = inputs.pop(0)
+        print(prompt + entry)
+        return played
+
+    with redirect_stdout(output):
+        for game in games:
+            answer = game['answer']
+            if answer is None:
+                recorded = tuple(value for _, kind, value in game['steps']
+                                 if kind == GUESS)
+                answer = infer_answer(recorded, answers) or ''
+            inputs = [(entry, value[0] if kind == GUESS else entry)
+                      for entry, kind, value in game['steps']]
+            hints = [value for _, kind, value in game['steps']
+                     if kind == HINT]
+            history = ()
+            rules = HardModeRules() if hard else None
+            while inputs:
+                guess = a1.prompt_user(
+                    len(history) + 1, vocab, rules, read=typed
+                )
+                if guess == 'q':
+                    return output.getvalue()
+                elif guess == 'k':
+                    a1.print_keyboard(history)
+                elif guess == 'h':
+                    print(hints.pop(0))
+                else:
+                    history = a1.update_history(history, guess, answer)
+                    if rules is not None:
+                        rules.update(*history[-1])
+                    a1.print_history(history)
+                    if a1.has_won(guess, answer):
+                        print(WON + str(len(history)) + ' guesses!')
+                        break
+                    elif a1.has_lost(len(history)):
+                        print(LOST + answer)
+                        break
+            if game['again'] is None:
+                break
+            stats = a1.update_stats(stats, len(history), history[-1][0],
+                                    answer)
+            a1.print_stats(stats)
+            print(PLAY_AGAIN + game['again'])
+    return output.getvalue()
+
+
+def diff_transcript(
+        text: str, vocab: tuple[str, ...], answers: tuple[str, ...],
+        hard: bool = False, name: str = 'transcript') -> list[str]:
+    """ Returns the unified diff of a transcript against its replay
+
+    Parameters:
+    text (str): the transcript to check
+    vocab (tuple[str, ...]): words that can be guessed
+    answers (tuple[str, ...]): words that can be the answer
+    hard (bool): whether the transcript was played in hard mode
+    name (str): name of the transcript in the diff headers
+
+    Returns:
+    list[str]: the diff lines, empty if the replay matches
+    """
+    try:
+        replayed = replay(text, vocab, answers, hard)
+    except (IndexError, ValueError) as error:
+        # A transcript the game couldn't have printed
+        return [f'--- {name}', f'Could not replay: {error!r}']
+    return list(difflib.unified_diff(
+        text.splitlines(), replayed.splitlines(), name, name + ' (replayed)',
+        lineterm=''
+    ))
+
+
+def _init_worker() -> None:
+    """ Loads the word lists used by a worker process """
+    global _worker_words
+    _worker_words = load_words(VOCAB_FILE), load_words(ANSWERS_FILE)
+
+
+def _replay_file(path: str, hard: bool) -> tuple[str, list[str]]:
+    """ Replays one transcript file in a worker process
+
+    Returns:
+    tuple[str, list[str]]: the path and its diff lines
+    """
+    with open(path, encoding='utf-8') as file:
+        text = file.read()
+    return path, diff_transcript(text, *_worker_words, hard, name=path)
+
+
+def transcript_paths(paths: list[str]) -> list[str]:
+    """ Returns the transcript files in paths, expanding directories
+
+    Parameters:
+    paths (list[str]): transcript files and directories of them
+
+    Returns:
+    list[str]: the files, with each directory's transcripts in name order
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith(TRANSCRIPT_SUFFIX)
+            ))
+        else:
+            files.append(path)
+    return files
+
+
+def replay_files(
+        paths: list[str], workers: Optional[int] = None,
+        hard: bool = False):
+    """ Replays transcript files over a process pool
+
+    Results are yielded as they arrive, so a batch of any size can be
+    checked without holding every diff in memory.
+
+    Parameters:
+    paths (list[str]): the transcript files
+    workers (int): number of worker processes, defaults to the CPU count
+    hard (bool): whether the transcripts were played in hard mode
+
+    Yields:
+    tuple[str, list[str]]: each path and its diff lines, in path order
+    """
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as executor:
+        yield from executor.map(
+            _replay_file, paths, [hard] * len(paths), chunksize=CHUNK_SIZE
+        )
+
+
+class _WatchedPool(AnswerPool):
+    """ An answer pool that remembers the last answer it drew """
+
+    def __init__(self, answers: tuple[str, ...], seed: int) -> None:
+        super().__init__(answers, seed)
+        # None until the first answer is drawn
+        self.last = None
+
+    def draw(self) -> str:
+        self.last = super().draw()
+        return self.last
+
+
+class _FixedDictionary:
+    """ Stands in for Dictionary in main with word lists already loaded """
+
+    def __init__(
+            self, vocab: tuple[str, ...], answers: tuple[str, ...]) -> None:
+        self._vocab = vocab
+        self._answers = answers
+
+    def get_vocab(self, length: int) -> tuple[str, ...]:
+        return self._vocab
+
+    def get_answers(self, length: int) -> tuple[str, ...]:
+        return self._answers
+
+
+class _Player:
+    """ Types the inputs of a random player into a1.main
+
+    Every guess prompt gets a random input, which is a candidate answer
+    often enough for games to be won. In hard mode only guesses the rules
+    allow are typed, apart from the deliberately invalid inputs.
+    """
+
+    def __init__(
+            self, vocab: tuple[str, ...], answers: tuple[str, ...],
+            seed: int, games: int, hard: bool = False) -> None:
+        self._vocab = vocab
+        self._index = ConstraintIndex(answers)
+        self._random = Random(seed)
+        self._games = games
+        self._pool = _WatchedPool(answers, seed)
+        self._history = ()
+        self._rules = HardModeRules() if hard else None
+
+    def get_pool(self) -> AnswerPool:
+        """ Returns the pool for main to draw answers from, so they're seen """
+        return self._pool
+
+    def __call__(self, prompt: str) -> str:
+        """ Reads an input for main, echoing what it types """
+        if prompt == PLAY_AGAIN:
+            self._games -= 1
+            self._history = ()
+            if self._rules is not None:
+                self._rules = HardModeRules()
+            entry = 'y' if self._games > 0 else 'n'
+        else:
+            entry = self._choose()
+            guess = entry.lower()
+            # Rules are only checked for words, as they are by prompt_user
+            if guess in self._vocab and (
+                    self._rules is None
+                    or self._rules.violation(guess) is None):
+                squares = a1.process_guess(guess, self._pool.last)
+                self._history += ((guess, squares),)
+                if self._rules is not None:
+                    self._rules.update(guess, squares)
+        print(prompt + entry)
+        return entry
+
+    def _choose(self) -> str:
+        """ Returns the next input for a guess prompt """
+        roll = self._random.random()
+        if roll < KEYBOARD_CHANCE:
+            return 'k'
+        if roll < KEYBOARD_CHANCE + INVALID_CHANCE:
+            word = self._random.choice(self._vocab)
+            # Too short, or reversed in upper case, which is rarely a word
+            invalid = [word[:5], word[::-1].upper()]
+            if self._rules is not None and self._rules.violation(word):
+                # A word hard mode doesn't allow
+                invalid.append(word)
+            return self._random.choice(invalid)
+        candidates = self._index.candidates(self._history)
+        if candidates and self._random.random() < SOLVE_CHANCE:
+            return self._random.choice(candidates)
+        word = self._random.choice(self._vocab)
+        if self._rules is not None and self._rules.violation(word):
+            # Candidates always follow the rules
+            return self._random.choice(candidates)
+        return word
+
+
+def generate_transcript(
+        vocab: tuple[str, ...], answers: tuple[str, ...], seed: int,
+        games: int = 3, hard: bool = False) -> str:
+    """ Records a random player's session of main
+
+    Parameters:
+    vocab (tuple[str, ...]): words that can be guessed
+    answers (tuple[str, ...]): words that can be the answer
+    seed (int): seed for the answers and the player's inputs
+    games (int): number of games played
+    hard (bool): whether the games are played in hard mode
+
+    Returns:
+    str: everything main printed, inputs included
+    """
+    player = _Player(vocab, answers, seed, games, hard)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        a1.main(hard=hard, read=player,
+                dictionary=_FixedDictionary(vocab, answers),
+                pool=player.get_pool())
+    return output.getvalue()
+
+
+def _generate_file(
+        directory: str, seed: int, games: int, hard: bool) -> str:
+    """ Writes one generated transcript in a worker process """
+    path = os.path.join(directory, f'transcript-{seed:06d}.txt')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(generate_transcript(*_worker_words, seed, games, hard))
+    return path
+
+
+def generate_files(
+        directory: str, count: int, games: int = 3,
+        workers: Optional[int] = None, hard: bool = False) -> list[str]:
+    """ Writes count generated transcripts to directory over a process pool
+
+    Parameters:
+    directory (str): where to write the transcripts
+    count (int): number of transcripts, seeded 0 to count - 1
+    games (int): games played in each transcript
+    workers (int): number of worker processes, defaults to the CPU count
+    hard (bool): whether the games are played in hard mode
+
+    Returns:
+    list[str]: paths of the transcripts written
+    """
+    os.makedirs(directory, exist_ok=True)
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as executor:
+        return list(executor.map(
+            _generate_file, [directory] * count, range(count),
+            [games] * count, [hard] * count, chunksize=CHUNK_SIZE
+        ))
+
+
+def print_report(report: dict) -> None:
+    """ Prints the results of a replay run
+
+    Parameters:
+    report (dict): as made by main
+    """
+    print(f"Replayed {report['transcripts']} transcripts in "
+          f"{report['seconds']:.2f}s "
+          f"({report['transcripts'] / max(report['seconds'], 1e-9):.0f}/s)")
+    print(f"{report['passed']} matched, {len(report['failed'])} differed")
+    for path in report['failed']:
+        print('  ' + path)
+
+
+def main():
+    """ Generates transcripts, or replays them and reports any differences """
+    arguments = sys.argv[1:]
+    generate = arguments[:1] == ['generate']
+    if generate:
+        arguments.pop(0)
+    hard = arguments[:1] == [HARD]
+    if hard:
+        arguments.pop(0)
+    if generate:
+        count, directory = int(arguments[0]), arguments[1]
+        games = int(arguments[2]) if len(arguments) > 2 else 3
+        workers = int(arguments[3]) if len(arguments) > 3 else None
+        start = time.perf_counter()
+        paths = generate_files(directory, count, games, workers, hard)
+        print(f'Generated {len(paths)} transcripts in {directory} in '
+              f'{time.perf_counter() - start:.2f}s')
+        return
+    workers = None
+    if arguments and arguments[-1].isdigit():
+        workers = int(arguments.pop())
+    paths = transcript_paths(arguments)
+    start = time.perf_counter()
+    report = {'transcripts': 0, 'passed': 0, 'failed': []}
+    shown = 0
+    for path, diff in replay_files(paths, workers, hard):
+        report['transcripts'] += 1
+        if not diff:
+            report['passed'] += 1
+            continue
+        report['failed'].append(path)
+        if shown < DIFF_LINES:
+            print('\n'.join(diff[:DIFF_LINES - shown]))
+            shown += len(diff)
+    report['seconds'] = time.perf_counter() - start
+    print_report(report)
+    if report['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
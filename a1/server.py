@@ -0,0 +1,251 @@
+"""
+Wordle server
+Hosts many games at once over a line protocol on a TCP or Unix socket. Every
+connection plays its own session, while all sessions share one loaded copy of
+the word lists.
+
+Each request is one line, answered with one line:
+    GUESS <word>  ->  RESULT <squares> PLAYING
+                      RESULT <squares> WON <guesses>
+                      RESULT <squares> LOST <answer>
+    NEW <length>  ->  GAME <length>
+    STATS         ->  STATS <wins in 1..6 guesses> <losses>
+    LATENCY       ->  LATENCY <count> <p50> <p90> <p99> (milliseconds)
+    QUIT          ->  BYE
+Invalid requests are answered with ERROR <reason>. A new game of the same
+word length starts as soon as the last one is won or lost, and NEW abandons
+the current game for one of another length. Games are 6 letters to start
+with, and the words of other lengths are only loaded once a game uses them.
+
+Run from the a1 directory: python server.py [port | socket path]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from typing import Optional
+
+from answer_pool import AnswerPool
+from dictionary import Dictionary, MIN_LENGTH, MAX_LENGTH, WORD_LENGTH
+from session import GameSession
+
+
+HOST = '127.0.0.1'
+PORT = 6001
+ENCODING = 'utf-8'
+# Connections waiting to be accepted, enough for a burst of load test players
+BACKLOG = 4096
+# Latencies kept for the percentiles, the oldest are dropped first
+LATENCY_SAMPLES = 100000
+PERCENTILES = (50, 90, 99)
+# Seconds between latency reports printed by the server
+REPORT_INTERVAL = 10
+
+
+def percentiles(
+        samples: list[float],
+        points: tuple[int, ...] = PERCENTILES) -> tuple[float, ...]:
+    """ Returns the nearest-rank percentiles of samples
+
+    Parameters:
+    samples (list[float]): values to summarise
+    points (tuple[int, ...]): percentiles to return, from 0 to 100
+
+    Returns:
+    tuple[float, ...]: the value at each percentile, 0 if there are none
+    """
+    if not samples:
+        return (0.0,) * len(points)
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return tuple(ordered[round(point / 100 * last)] for point in points)
+
+
+class WordleServer:
+    """ Serves a session of games to each connection
+
+    The word lists of each length are loaded once and shared by every
+    session, which only hold their own history, keyboard, stats and an
+    answer pool for each length they have played.
+    """
+
+    def __init__(
+            self, dictionary: Dictionary,
+            seed: Optional[float] = None) -> None:
+        """ Creates a server for games over the words in dictionary
+
+        Parameters:
+        dictionary (Dictionary): words that can be guessed and answered
+        seed (float): seed for the answers of every session, or None
+        """
+        self._dictionary = dictionary
+        self._seed = seed
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._sessions = 0
+
+    def get_latencies(self) -> tuple[float, ...]:
+        """ Returns recent guess latencies in seconds, oldest first """
+        return tuple(self._latencies)
+
+    def get_sessions(self) -> int:
+        """ Returns the number of connections currently playing """
+        return self._sessions
+
+    def respond(
+            self, request: str, session: GameSession,
+            pools: dict[int, AnswerPool]) -> Optional[str]:
+        """ Returns the response line to one request
+
+        Parameters:
+        request (str): the request line, without its newline
+        session (GameSession): the session of the connection
+        pools (dict[int, AnswerPool]): answers for the connection's games,
+                                       by word length
+
+        Returns:
+        str: the response, or None if the connection should close
+        """
+        command, _, argument = request.strip().partition(' ')
+        command = command.upper()
+        if command == 'GUESS':
+            return self._guess(argument.strip().lower(), session, pools)
+        if command == 'NEW':
+            argument = argument.strip()
+            # Checked before the dictionary is asked, as loading a length
+            # blocks every other session
+            if (not argument.isdigit()
+                    or not MIN_LENGTH <= int(argument) <= MAX_LENGTH):
+                return (f'ERROR Length must be from {MIN_LENGTH} to '
+                        f'{MAX_LENGTH}')
+            length = int(argument)
+            if not self._dictionary.get_answers(length):
+                return f'ERROR No words of length {length}'
+            self._new_game(session, pools, length)
+            return f'GAME {length}'
+        if command == 'STATS':
+            return 'STATS ' + ' '.join(map(str, session.get_stats()))
+        if command == 'LATENCY':
+            latencies = percentiles(list(self._latencies))
+            return 'LATENCY ' + ' '.join(
+                [str(len(self._latencies))]
+                + [f'{latency * 1000:.3f}' for latency in latencies]
+            )
+        if command == 'QUIT':
+            return None
+        return 'ERROR Unknown command'
+
+    def _guess(
+            self, guess: str, session: GameSession,
+            pools: dict[int, AnswerPool]) -> str:
+        """ Plays one guess and returns its response line """
+        start = time.perf_counter()
+        length = len(session.get_answer())
+        if len(guess) != length:
+            return 'ERROR Guess must be of length ' + str(length)
+        if guess not in self._dictionary.get_vocab(length):
+            return 'ERROR Unknown word'
+        squares = session.guess(guess)
+        if session.has_won():
+            response = (f'RESULT {squares} WON '
+                        f'{session.get_guess_number() - 1}')
+        elif session.has_lost():
+            response = f'RESULT {squares} LOST {session.get_answer()}'
+        else:
+            response = f'RESULT {squares} PLAYING'
+        if session.has_won() or session.has_lost():
+            session.finish_game()
+            self._new_game(session, pools, length)
+        self._latencies.append(time.perf_counter() - start)
+        return response
+
+    def _new_game(
+            self, session: GameSession, pools: dict[int, AnswerPool],
+            length: int) -> None:
+        """ Starts the next game of a session with a word of length """
+        if length not in pools:
+            pools[length] = AnswerPool(
+                self._dictionary.get_answers(length), self._seed
+            )
+        pool = pools[length]
+        if not pool.remaining():
+            pool.reset()
+        session.new_game(pool.draw())
+
+    async def handle(
+            self, reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter) -> None:
+        """ Plays a session with one connection until it quits or closes """
+        session = GameSession()
+        pools = {}
+        self._new_game(session, pools, WORD_LENGTH)
+        self._sessions += 1
+        try:
+            while line := await reader.readline():
+                response = self.respond(line.decode(ENCODING), session, pools)
+                if response is None:
+                    writer.write(b'BYE\n')
+                    break
+                writer.write(response.encode(ENCODING) + b'\n')
+                await writer.drain()
+        except (ConnectionError, UnicodeDecodeError):
+            # The client went away or sent garbage, drop the connection
+            pass
+        finally:
+            self._sessions -= 1
+            writer.close()
+
+    async def report(self, interval: float = REPORT_INTERVAL) -> None:
+        """ Prints the guess latency percentiles every interval seconds """
+        while True:
+            await asyncio.sleep(interval)
+            p50, p90, p99 = percentiles(list(self._latencies))
+            print(f'{self._sessions} sessions, {len(self._latencies)} '
+                  f'guesses: p50 {p50 * 1000:.3f}ms p90 {p90 * 1000:.3f}ms '
+                  f'p99 {p99 * 1000:.3f}ms', flush=True)
+
+
+async def start_server(
+        server: WordleServer, address: str = str(PORT)) -> asyncio.Server:
+    """ Listens for connections to server at address
+
+    Parameters:
+    server (WordleServer): the server to hand connections to
+    address (str): TCP port on localhost, or the path of a Unix socket
+
+    Returns:
+    asyncio.Server: the listening socket server
+    """
+    if address.isdigit():
+        return await asyncio.start_server(
+            server.handle, HOST, int(address), backlog=BACKLOG
+        )
+    return await asyncio.start_unix_server(
+        server.handle, address, backlog=BACKLOG
+    )
+
+
+async def main(address: str = str(PORT)) -> None:
+    """ Serves games at address until interrupted
+
+    Parameters:
+    address (str): TCP port on localhost, or the path of a Unix socket
+    """
+    server = WordleServer(Dictionary())
+    listener = await start_server(server, address)
+    print('Serving Wordle on ' + address, flush=True)
+    try:
+        async with listener:
+            await asyncio.gather(listener.serve_forever(), server.report())
+    finally:
+        if not address.isdigit() and os.path.exists(address):
+            # Unix sockets outlive their server unless removed
+            os.remove(address)
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(main(*sys.argv[1:2]))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,155 @@
+"""
+Wordle game session
+Keeps the history, keyboard and stats of a session up to date one guess at a
+time instead of rebuilding them from the whole history.
+"""
+
+from string import ascii_lowercase
+from typing import Optional
+
+from a1_support import CORRECT, MISPLACED, INCORRECT, UNSEEN
+from constraints import HardModeRules
+from patterns import grade, decode_pattern
+
+
+# Lower rank is a 'better' square: Green > Yellow > Black > Unseen
+SQUARE_RANKS = {CORRECT: 0, MISPLACED: 1, INCORRECT: 2, UNSEEN: 3}
+MAX_GUESSES = 6
+
+
+class Keyboard:
+    """ The best square seen so far for each letter of the alphabet """
+
+    def __init__(self) -> None:
+        """ Creates a keyboard where no letter has been seen """
+        self._letters = dict.fromkeys(ascii_lowercase, UNSEEN)
+
+    def update(self, guess: str, squares: str) -> None:
+        """ Records the squares of one guess, keeping the better squares
+
+        Parameters:
+        guess (str): a guessed word
+        squares (str): square representation of guess
+        """
+        letters = self._letters
+        for char, square in zip(guess, squares):
+            if SQUARE_RANKS[square] < SQUARE_RANKS[letters[char]]:
+                letters[char] = square
+
+    def get_letters(self) -> dict[str, str]:
+        """ Returns a copy of the square shown for each letter """
+        return dict(self._letters)
+
+    def format(self) -> str:
+        """ Returns the keyboard as printed by print_keyboard
+
+        The letters are shown in two columns, with a blank line before the
+        heading and after the last row.
+        """
+        lines = ['', 'Keyboard information', '-' * 12]
+        keys = list(self._letters)
+        for i in range(0, len(keys), 2):
+            lines.append('\t'.join(
+                key + ': ' + self._letters[key] for key in keys[i:i + 2]
+            ))
+        return '\n'.join(lines) + '\n\n'
+
+
+class GameSession:
+    """ The state of a session of wordle games
+
+    History, keyboard, hard mode rules and stats are stored in mutable
+    containers that are updated in place, so each guess costs O(word
+    length).
+    """
+
+    def __init__(self, max_guesses: int = MAX_GUESSES) -> None:
+        """ Creates a session with no games played
+
+        Parameters:
+        max_guesses (int): number of guesses allowed in a game
+        """
+        self._max_guesses = max_guesses
+        # Wins in 1..max_guesses guesses, followed by losses
+        self._stats = [0] * (max_guesses + 1)
+        self.new_game('')
+
+    def new_game(self, answer: str) -> None:
+        """ Starts a new game, keeping the stats of earlier games
+
+        Parameters:
+        answer (str): answer to the new game
+        """
+        self._answer = answer
+        self._history = []
+        self._keyboard = Keyboard()
+        self._rules = HardModeRules()
+
+    def get_answer(self) -> str:
+        """ Returns the answer of the current game """
+        return self._answer
+
+    def get_guess_number(self) -> int:
+        """ Returns the number of the next guess in the current game """
+        return len(self._history) + 1
+
+    def get_history(self) -> tuple[tuple[str, str], ...]:
+        """ Returns the history of the current game
+
+        Returns:
+        tuple[tuple[str,str],...]: Tuple with guess words and squares
+        """
+        return tuple(self._history)
+
+    def get_keyboard(self) -> Keyboard:
+        """ Returns the keyboard of the current game """
+        return self._keyboard
+
+    def get_rules(self) -> HardModeRules:
+        """ Returns what hard mode requires of the next guess """
+        return self._rules
+
+    def get_stats(self) -> tuple[int, ...]:
+        """ Returns the stats of every finished game
+
+        Returns:
+        tuple[int, ...]: wins by number of guesses, followed by losses
+        """
+        return tuple(self._stats)
+
+    def guess(self, guess: str, squares: Optional[str] = None) -> str:
+        """ Grades a guess and records it in the history and keyboard
+
+        Parameters:
+        guess (str): the users guess
+        squares (str): squares to record instead of grading guess against
+                       the answer, for games without a fixed answer
+
+        Returns:
+        str: square representation of guess
+        """
+        if squares is None:
+            squares = decode_pattern(grade(guess, self._answer), len(guess))
+        self._history.append((guess, squares))
+        self._keyboard.update(guess, squares)
+        self._rules.update(guess, squares)
+        return squares
+
+    def has_won(self) -> bool:
+        """ Returns whether the last guess was the answer """
+        if not self._history:
+            return False
+        guess, squares = self._history[-1]
+        return squares == CORRECT * len(guess)
+
+    def has_lost(self) -> bool:
+        """ Returns whether every guess has been used without winning """
+        return (len(self._history) >= self._max_guesses
+                and not self.has_won())
+
+    def finish_game(self) -> None:
+        """ Adds the result of the current game to the stats """
+        if self.has_won():
+            self._stats[len(self._history) - 1] += 1
+        else:
+            self._stats[self._max_guesses] += 1
@@ -0,0 +1,168 @@
+"""
+Shared feedback matrix
+Publishes the feedback matrix and encoded word lists once in shared memory,
+so worker processes attach to them by name instead of loading and copying
+their own.
+"""
+
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from feedback import FeedbackMatrix, encode_words
+
+
+# Arrays published for a feedback matrix
+PATTERNS = 'patterns'
+GUESSES = 'guesses'
+ANSWERS = 'answers'
+
+# Shared memory blocks attached in this process, kept open while in use
+_attached = []
+
+
+def _unlink(blocks: list[SharedMemory]) -> None:
+    """ Closes and removes shared memory blocks that still exist """
+    for block in blocks:
+        block.close()
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            # Already removed
+            pass
+    blocks.clear()
+
+
+class SharedArrays:
+    """ NumPy arrays copied into named shared memory blocks
+
+    The process that creates a SharedArrays owns the blocks. They are
+    removed by close, on leaving a with block, when the SharedArrays is
+    garbage collected, or at interpreter exit, whichever comes first.
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray]) -> None:
+        """ Copies arrays into new shared memory blocks
+
+        Parameters:
+        arrays (dict[str, np.ndarray]): arrays to publish, by name
+        """
+        self._blocks = []
+        self._specs = {}
+        self._finalizer = weakref.finalize(self, _unlink, self._blocks)
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            # Zero sized blocks aren't allowed, empty arrays get one byte
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            self._blocks.append(block)
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self._specs[name] = (block.name, array.shape, array.dtype.str)
+
+    def get_specs(self) -> dict[str, tuple[str, tuple[int, ...], str]]:
+        """ Returns what attach needs to find each array
+
+        Returns:
+        dict[str, tuple[str, tuple[int, ...], str]]: (block name, shape,
+            dtype) of each array, by array name. Safe to pickle.
+        """
+        return dict(self._specs)
+
+    def close(self) -> None:
+        """ Removes the shared memory blocks """
+        self._finalizer()
+
+    def __enter__(self) -> 'SharedArrays':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def attach(
+        specs: dict[str, tuple[str, tuple[int, ...], str]]
+        ) -> dict[str, np.ndarray]:
+    """ Returns read-only views of arrays published by a SharedArrays
+
+    Nothing is copied, every process attached to a block sees the same
+    memory. The blocks stay open for the life of this process.
+
+    Parameters:
+    specs (dict[str, tuple[str, tuple[int, ...], str]]): from get_specs
+
+    Returns:
+    dict[str, np.ndarray]: the shared arrays, by name
+    """
+    arrays = {}
+    for name, (block_name, shape, dtype) in specs.items():
+        # Pool workers share their parent's resource tracker, which already
+        # knows the block, so attaching doesn't change who removes it
+        block = SharedMemory(name=block_name)
+        _attached.append(block)
+        array = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+    return arrays
+
+
+def decode_words(encoded: np.ndarray) -> tuple[str, ...]:
+    """ Returns the words of an array made by feedback.encode_words """
+    count, length = encoded.shape
+    text = (encoded + ord('a')).astype(np.uint8).tobytes().decode('ascii')
+    return tuple(text[i:i + length] for i in range(0, count * length, length))
+
+
+class SharedFeedbackMatrix(FeedbackMatrix):
+    """ A feedback matrix whose patterns live in shared memory """
+
+    def __init__(
+            self, guesses: tuple[str, ...], answers: tuple[str, ...],
+            patterns: np.ndarray) -> None:
+        """ Wraps patterns already computed for guesses and answers
+
+        Parameters:
+        guesses (tuple[str, ...]): words that can be guessed (vocab)
+        answers (tuple[str, ...]): words that can be the answer
+        patterns (np.ndarray): pattern codes of every guess against every
+                               answer
+        """
+        self._guesses = tuple(guesses)
+        self._answers = tuple(answers)
+        self._guess_index = {word: i for i, word in enumerate(self._guesses)}
+        self._answer_index = {word: i for i, word in enumerate(self._answers)}
+        self._path = None
+        self._matrix = patterns
+
+
+def publish_feedback(matrix: FeedbackMatrix) -> SharedArrays:
+    """ Publishes a feedback matrix and its word lists in shared memory
+
+    Parameters:
+    matrix (FeedbackMatrix): the matrix to publish
+
+    Returns:
+    SharedArrays: the published arrays, to be closed once workers finish
+    """
+    return SharedArrays({
+        PATTERNS: matrix.as_array(),
+        GUESSES: encode_words(matrix.get_guesses()),
+        ANSWERS: encode_words(matrix.get_answers()),
+    })
+
+
+def attach_feedback(
+        specs: dict[str, tuple[str, tuple[int, ...], str]]
+        ) -> SharedFeedbackMatrix:
+    """ Attaches to a feedback matrix published by publish_feedback
+
+    Parameters:
+    specs (dict[str, tuple[str, tuple[int, ...], str]]): from get_specs
+
+    Returns:
+    SharedFeedbackMatrix: the matrix, backed by the shared memory
+    """
+    arrays = attach(specs)
+    return SharedFeedbackMatrix(
+        decode_words(arrays[GUESSES]), decode_words(arrays[ANSWERS]),
+        arrays[PATTERNS]
+    )
@@ -0,0 +1,275 @@
+"""
+Headless Wordle simulation
+Plays complete games against a strategy instead of a user, spread over a
+process pool, and collects the results in the same stats layout as main.
+Games of different word lengths can be mixed in one run.
+
+Run from the a1 directory: python simulation.py [strategy] [workers] [lengths]
+where lengths is a comma separated list such as 5,6,7 (6 by default)
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from a1 import has_won, has_lost, update_history, update_stats, print_stats
+from a1_support import VOCAB_FILE, ANSWERS_FILE
+from dictionary import Dictionary, WORD_LENGTH
+from feedback import FeedbackMatrix
+from opening_book import OpeningBook
+from session import MAX_GUESSES
+from sharedmem import attach_feedback, publish_feedback
+from solver import Solver, ENTROPY
+
+
+# A strategy picks the next guess given the history of the game so far and
+# the length of the answer
+Strategy = Callable[[tuple[tuple[str, str], ...], int], str]
+EMPTY_STATS = (0, 0, 0, 0, 0, 0, 0)
+# Answers sent to a worker at a time
+CHUNK_SIZE = 16
+
+# Strategy used by the games played in this worker process
+_worker_strategy = None
+
+
+class SolverStrategy:
+    """ Strategy that plays the best guess of a Solver
+
+    Only the strategy and word list names are pickled, so a SolverStrategy
+    can be sent to worker processes cheaply. Each process loads its own
+    solver for a word length the first time it plays that length. The
+    entropy strategy plays its first two guesses from the opening book when
+    one has been built, unless the book is turned off.
+    """
+
+    def __init__(
+            self, strategy: str = ENTROPY, vocab_file: str = VOCAB_FILE,
+            answers_file: str = ANSWERS_FILE, use_book: bool = True) -> None:
+        """ Creates a strategy using the named solver strategy
+
+        Parameters:
+        strategy (str): name of a strategy in solver.STRATEGIES
+        vocab_file (str): word list of the words that can be guessed
+        answers_file (str): word list of the words that can be the answer
+        use_book (bool): whether to play the opening book when there is one
+        """
+        self._strategy = strategy
+        self._files = (vocab_file, answers_file)
+        self._use_book = use_book
+        self._dictionary = None
+        # length -> Solver
+        self._solvers = {}
+        # length -> OpeningBook
+        self._books = {}
+
+    def __call__(
+            self, history: tuple[tuple[str, str], ...],
+            length: int = WORD_LENGTH) -> str:
+        """ Returns the solver's best guess for history """
+        if (self._use_book and self._strategy == ENTROPY
+                and len(history) <= 1):
+            if length not in self._books:
+                matrix = self.get_solver(length).get_matrix()
+                self._books[length] = OpeningBook(
+                    matrix.get_guesses(), matrix.get_answers()
+                )
+            guess = self._books[length].next_guess(history)
+            if guess is not None:
+                return guess
+        return self.get_solver(length).best_guess(history)
+
+    def get_solver(self, length: int = WORD_LENGTH) -> Solver:
+        """ Returns the solver for words of length, loading it on first use
+
+        Raises:
+        ValueError: if there are no answers of length
+        """
+        if length not in self._solvers:
+            if self._dictionary is None:
+                self._dictionary = Dictionary(*self._files)
+            if not self._dictionary.get_answers(length):
+                raise ValueError(f'No answers of length {length}')
+            self.set_matrix(self._dictionary.get_matrix(length))
+        return self._solvers[length]
+
+    def set_matrix(self, matrix: FeedbackMatrix) -> None:
+        """ Uses a solver over an already loaded feedback matrix
+
+        Parameters:
+        matrix (FeedbackMatrix): matrix of the vocab against the answers,
+                                 used for words of the answers' length
+        """
+        length = len(matrix.get_answers()[0])
+        self._solvers[length] = Solver(
+            matrix.get_guesses(), matrix.get_answers(), self._strategy,
+            matrix
+        )
+
+    def __getstate__(self) -> dict:
+        """ Leaves the loaded solvers out when pickling """
+        return {
+            '_strategy': self._strategy, '_files': self._files,
+            '_use_book': self._use_book, '_dictionary': None, '_solvers': {}, '_books': {},
+        }
+
+
+def play_game(
+        answer: str, strategy: Strategy,
+        max_guesses: int = MAX_GUESSES
+        ) -> tuple[int, str, tuple[tuple[str, str], ...]]:
+    """ Plays one game of wordle with guesses chosen by strategy
+
+    Parameters:
+    answer (str): answer to the wordle game
+    strategy (Strategy): picks each guess from the history so far
+    max_guesses (int): number of guesses allowed
+
+    Returns:
+    tuple[int, str, tuple[tuple[str,str],...]]: the final guess number, the
+        final guess and the history of the game, as used by update_stats
+    """
+    guess_number = 1
+    history = ()
+    while True:
+        guess = strategy(history, len(answer))
+        history = update_history(history, guess, answer)
+        if has_won(guess, answer) or has_lost(guess_number, max_guesses):
+            return guess_number, guess, history
+        guess_number += 1
+
+
+def play_games(
+        answers: tuple[str, ...], strategy: Strategy,
+        stats: tuple[int, ...] = EMPTY_STATS) -> tuple[int, ...]:
+    """ Plays a game for every answer and adds the results to stats
+
+    Parameters:
+    answers (tuple[str, ...]): the answer of each game to play
+    strategy (Strategy): picks each guess from the history so far
+    stats (tuple[int, ...]): stats to add the results to, whose length sets
+                             the number of guesses allowed
+
+    Returns:
+    tuple[int, ...]: stats updated with every game
+    """
+    for answer in answers:
+        guess_number, guess, _ = play_game(answer, strategy, len(stats) - 1)
+        stats = update_stats(stats, guess_number, guess, answer)
+    return stats
+
+
+def _init_worker(strategy: Strategy, specs: Optional[list] = None) -> None:
+    """ Stores the strategy for the games played in a worker process
+
+    Parameters:
+    strategy (Strategy): picks each guess
+    specs (list): specs of the feedback matrix of each word length played,
+                  published in shared memory for a SolverStrategy to use,
+                  or None
+    """
+    global _worker_strategy
+    for matrix_specs in specs or ():
+        strategy.set_matrix(attach_feedback(matrix_specs))
+    _worker_strategy = strategy
+
+
+def _play_chunk(
+        answers: tuple[str, ...], max_guesses: int) -> tuple[int, ...]:
+    """ Plays a chunk of games in a worker process """
+    return play_games(answers, _worker_strategy, (0,) * (max_guesses + 1))
+
+
+def simulate(
+        answers: tuple[str, ...], strategy: Strategy,
+        workers: Optional[int] = None,
+        max_guesses: int = MAX_GUESSES) -> tuple[tuple[int, ...], dict]:
+    """ Plays a game for every answer over a pool of processes
+
+    Answers can be of different lengths. Only the lengths among them are
+    loaded.
+
+    Parameters:
+    answers (tuple[str, ...]): the answer of each game to play
+    strategy (Strategy): picks each guess, must be picklable
+    workers (int): number of worker processes, defaults to the CPU count
+    max_guesses (int): number of guesses allowed in each game
+
+    Returns:
+    tuple[tuple[int, ...], dict]: the combined stats and a throughput
+        report with the games played, workers, cores used, seconds taken,
+        games per second and games per second per core
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [
+        tuple(answers[i:i + CHUNK_SIZE])
+        for i in range(0, len(answers), CHUNK_SIZE)
+    ]
+    stats = [0] * (max_guesses + 1)
+    start = time.perf_counter()
+    # Solver workers share one copy of each matrix instead of loading their
+    # own
+    shared = []
+    specs = None
+    if isinstance(strategy, SolverStrategy):
+        for length in sorted(set(map(len, answers))):
+            shared.append(
+                publish_feedback(strategy.get_solver(length).get_matrix())
+            )
+        specs = [arrays.get_specs() for arrays in shared]
+    try:
+        with ProcessPoolExecutor(
+                workers, initializer=_init_worker,
+                initargs=(strategy, specs)) as executor:
+            for chunk_stats in executor.map(
+                    _play_chunk, chunks, [max_guesses] * len(chunks)):
+                for i, count in enumerate(chunk_stats):
+                    stats[i] += count
+    finally:
+        for arrays in shared:
+            arrays.close()
+    elapsed = time.perf_counter() - start
+    # Workers beyond the number of CPUs share cores rather than adding them
+    cores = min(workers, os.cpu_count() or 1)
+    report = {
+        'games': len(answers),
+        'workers': workers,
+        'cores': cores,
+        'seconds': elapsed,
+        'games_per_second': len(answers) / elapsed,
+        'games_per_second_per_core': len(answers) / elapsed / cores,
+    }
+    return tuple(stats), report
+
+
+def print_report(report: dict) -> None:
+    """ Prints out a throughput report from simulate
+
+    Parameters:
+    report (dict): the report returned by simulate
+    """
+    print(f"\n{report['games']} games in {report['seconds']:.2f}s on "
+          f"{report['workers']} workers ({report['cores']} cores)")
+    print(f"{report['games_per_second']:.1f} games/s, "
+          f"{report['games_per_second_per_core']:.1f} games/s per core")
+
+
+def main():
+    """ Simulates every answer with a solver strategy and prints the results """
+    strategy = sys.argv[1] if len(sys.argv) > 1 else ENTROPY
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    lengths = sys.argv[3] if len(sys.argv) > 3 else str(WORD_LENGTH)
+    dictionary = Dictionary()
+    answers = tuple(
+        answer for length in lengths.split(',')
+        for answer in dictionary.get_answers(int(length))
+    )
+    stats, report = simulate(answers, SolverStrategy(strategy), workers)
+    print_stats(stats)
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
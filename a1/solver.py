@@ -0,0 +1,296 @@
+"""
+Wordle solver
+Ranks the next guess for a game history by how well it splits the answers
+that are still consistent with that history.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+from constraints import ConstraintIndex, HardModeRules
+from feedback import FeedbackMatrix
+from patterns import encode_pattern
+
+
+# Names of the built in strategies
+ENTROPY = 'entropy'
+MINIMAX = 'minimax'
+EXPECTED_SIZE = 'expected_size'
+# Missing answers named in the error when answers aren't all in the vocab
+MISSING_SHOWN = 5
+# Histories whose rankings are kept. Each ranking holds an order and a score
+# for every vocab word, so a few hundred KB with the full vocab.
+RANK_CACHE_SIZE = 32
+
+
+def partition_sizes(patterns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """ Groups each row of patterns into partitions of equal pattern codes
+
+    Parameters:
+    patterns (np.ndarray): pattern codes of shape (guesses, candidates)
+
+    Returns:
+    tuple[np.ndarray, np.ndarray]: (rows, sizes) where sizes[i] is the size
+                                   of a partition made by guess rows[i].
+                                   Partitions of a row are contiguous.
+    """
+    num_guesses, total = patterns.shape
+    ordered = np.sort(patterns, axis=1)
+    starts = np.empty(ordered.shape, dtype=bool)
+    starts[:, 0] = True
+    np.not_equal(ordered[:, 1:], ordered[:, :-1], out=starts[:, 1:])
+    positions = np.flatnonzero(starts)
+    sizes = np.diff(positions, append=num_guesses * total)
+    return positions // total, sizes
+
+
+def entropy_scores(
+        rows: np.ndarray, sizes: np.ndarray, num_guesses: int,
+        total: int) -> np.ndarray:
+    """ Expected information gain (bits) of each guess """
+    counts = np.arange(total + 1)
+    # n * log2(n) for every possible partition size, with 0 for n = 0
+    weights = np.zeros(total + 1)
+    weights[1:] = counts[1:] * np.log2(counts[1:])
+    spread = np.bincount(rows, weights=weights[sizes], minlength=num_guesses)
+    return np.log2(total) - spread / total
+
+
+def minimax_scores(
+        rows: np.ndarray, sizes: np.ndarray, num_guesses: int,
+        total: int) -> np.ndarray:
+    """ Negated size of the largest partition of each guess """
+    # Every row has at least one partition, so row starts are where it changes
+    firsts = np.flatnonzero(np.diff(rows, prepend=-1))
+    return -np.maximum.reduceat(sizes, firsts).astype(float)
+
+
+def expected_size_scores(
+        rows: np.ndarray, sizes: np.ndarray, num_guesses: int,
+        total: int) -> np.ndarray:
+    """ Negated expected number of answers left after each guess """
+    squares = (sizes * sizes).astype(float)
+    return -np.bincount(rows, weights=squares, minlength=num_guesses) / total
+
+
+# Each strategy maps (rows, sizes, num_guesses, total) to one score per
+# guess, where a higher score is a better guess
+STRATEGIES: dict[str, Callable[..., np.ndarray]] = {
+    ENTROPY: entropy_scores,
+    MINIMAX: minimax_scores,
+    EXPECTED_SIZE: expected_size_scores,
+}
+
+
+class Solver:
+    """ Suggests guesses using a precomputed feedback matrix
+
+    Candidate answers are found by matching each guess in the history
+    against its row of the matrix, and every vocab word is scored from the
+    sizes of the partitions it splits the candidates into.
+    """
+
+    def __init__(
+            self, vocab: tuple[str, ...], answers: tuple[str, ...],
+            strategy: str = ENTROPY,
+            matrix: Optional[FeedbackMatrix] = None) -> None:
+        """ Creates a solver over vocab and answers
+
+        Parameters:
+        vocab (tuple[str, ...]): words that can be guessed
+        answers (tuple[str, ...]): words that can be the answer
+        strategy (str): name of a strategy in STRATEGIES
+        matrix (FeedbackMatrix): matrix of vocab against answers, loaded
+                                 from the cache if not given
+
+        Raises:
+        ValueError: if some answers aren't in the vocab, as every answer is
+                    also scored as a guess
+        """
+        if matrix is not None:
+            vocab, answers = matrix.get_guesses(), matrix.get_answers()
+        known = set(vocab)
+        missing = [answer for answer in answers if answer not in known]
+        if missing:
+            shown = ', '.join(missing[:MISSING_SHOWN])
+            more = len(missing) - MISSING_SHOWN
+            raise ValueError(
+                f'{len(missing)} answers are not in the vocab: {shown}'
+                + (f' and {more} more' if more > 0 else '')
+            )
+        self._matrix = matrix or FeedbackMatrix(vocab, answers)
+        # A view of the memory mapped matrix, so rows are only read from disk
+        # the first time they're used and are shared between processes
+        self._patterns = np.asarray(self._matrix.as_array())
+        self._vocab = self._matrix.get_guesses()
+        self._answers = self._matrix.get_answers()
+        self._answer_rows = np.array(
+            [self._matrix.guess_index(answer) for answer in self._answers]
+        )
+        # history -> (order, scores), least recently used first
+        self._cache = OrderedDict()
+        # Only built the first time hard mode guesses are ranked
+        self._index = None
+        self.set_strategy(strategy)
+
+    def get_strategy(self) -> str:
+        """ Returns the name of the strategy used to score guesses """
+        return self._strategy
+
+    def set_strategy(self, strategy: str) -> None:
+        """ Changes the strategy used to score guesses
+
+        Parameters:
+        strategy (str): name of a strategy in STRATEGIES
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f'Unknown strategy: {strategy}')
+        self._strategy = strategy
+        self._cache.clear()
+
+    def get_matrix(self) -> FeedbackMatrix:
+        """ Returns the feedback matrix used by the solver """
+        return self._matrix
+
+    def candidate_indices(
+            self, history: tuple[tuple[str, str], ...]) -> np.ndarray:
+        """ Returns the answer columns consistent with history
+
+        Parameters:
+        history (tuple[tuple[str,str],...]): Tuple with guess words and squares
+
+        Returns:
+        np.ndarray: indices into the answers of every consistent answer
+        """
+        consistent = np.ones(len(self._answers), dtype=bool)
+        for guess, squares in history:
+            row = self._patterns[self._matrix.guess_index(guess)]
+            consistent &= row == encode_pattern(squares)
+        return np.flatnonzero(consistent)
+
+    def candidates(
+            self, history: tuple[tuple[str, str], ...]) -> tuple[str, ...]:
+        """ Returns the answers consistent with history
+
+        Parameters:
+        history (tuple[tuple[str,str],...]): Tuple with guess words and squares
+
+        Returns:
+        tuple[str, ...]: every answer that could still be correct
+        """
+        return tuple(
+            self._answers[i] for i in self.candidate_indices(history)
+        )
+
+    def rank(
+            self, history: tuple[tuple[str, str], ...], count: int = 10,
+            rules: Optional[HardModeRules] = None) -> list[tuple[str, float]]:
+        """ Returns the best next guesses for history, best first
+
+        Ties are broken in favour of guesses that could be the answer. The
+        rankings of the last RANK_CACHE_SIZE histories used are kept.
+
+        Parameters:
+        history (tuple[tuple[str,str],...]): Tuple with guess words and squares
+        count (int): number of guesses to return
+        rules (HardModeRules): only rank guesses these rules allow, if given
+
+        Returns:
+        list[tuple[str, float]]: (guess, score) pairs, higher scores better
+        """
+        key = tuple(history)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        else:
+            self._cache[key] = self._rank(self.candidate_indices(history))
+            if len(self._cache) > RANK_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        order, scores = self._cache[key]
+        if rules is not None:
+            order = order[self.legal_mask(rules)[order]]
+        return [(self._vocab[i], float(scores[i])) for i in order[:count]]
+
+    def best_guess(
+            self, history: tuple[tuple[str, str], ...],
+            rules: Optional[HardModeRules] = None) -> str:
+        """ Returns the best next guess for history
+
+        Parameters:
+        history (tuple[tuple[str,str],...]): Tuple with guess words and squares
+        rules (HardModeRules): only suggest guesses these rules allow
+
+        Returns:
+        str: the highest ranked guess
+        """
+        return self.rank(history, 1, rules)[0][0]
+
+    def get_index(self) -> ConstraintIndex:
+        """ Returns the hard mode index of the vocab, built on first use """
+        if self._index is None:
+            self._index = ConstraintIndex(self._vocab)
+        return self._index
+
+    def legal_mask(self, rules: HardModeRules) -> np.ndarray:
+        """ Returns which vocab words hard mode allows as the next guess
+
+        Parameters:
+        rules (HardModeRules): hard mode rules of the game
+
+        Returns:
+        np.ndarray: bool array with one entry per vocab word
+        """
+        state = rules.legal(self.get_index())
+        size = len(self._vocab)
+        bits = np.frombuffer(
+            state.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8
+        )
+        return np.unpackbits(bits, bitorder='little')[:size].astype(bool)
+
+    def rank_candidates(
+            self, candidates: np.ndarray, count: int = 10) -> list[int]:
+        """ Returns the best guesses for a set of candidate answers
+
+        Parameters:
+        candidates (np.ndarray): indices into the answers of the candidates
+        count (int): number of guesses to return
+
+        Returns:
+        list[int]: vocab indices of the best guesses, best first
+        """
+        order, _ = self._rank(np.asarray(candidates))
+        return [int(i) for i in order[:count]]
+
+    def get_patterns(self) -> np.ndarray:
+        """ Returns the feedback matrix of vocab against answers as an array """
+        return self._patterns
+
+    def _rank(
+            self,
+            candidates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """ Scores every vocab word against a set of candidate answers
+
+        Parameters:
+        candidates (np.ndarray): indices of the candidate answers
+
+        Returns:
+        tuple[np.ndarray, np.ndarray]: (guess indices best first, scores)
+        """
+        num_guesses = len(self._vocab)
+        if not len(candidates):
+            # History is inconsistent with every answer, nothing to split
+            return np.arange(num_guesses), np.zeros(num_guesses)
+        if len(candidates) == len(self._answers):
+            patterns = self._patterns
+        else:
+            patterns = self._patterns[:, candidates]
+        rows, sizes = partition_sizes(patterns)
+        scores = STRATEGIES[self._strategy](
+            rows, sizes, num_guesses, len(candidates)
+        )
+        is_candidate = np.zeros(num_guesses, dtype=bool)
+        is_candidate[self._answer_rows[candidates]] = True
+        # lexsort sorts by the last key first
+        order = np.lexsort((~is_candidate, -scores))
+        return order, scores
@@ -0,0 +1,124 @@
+"""
+Wordle vocabulary index
+A tuple of words with hash-based membership, word ids and prefix lookups.
+"""
+
+from bisect import bisect_left
+
+
+# Shortest prefix a guess must share with a word for it to be suggested
+MIN_SUGGESTION_PREFIX = 2
+# Character that sorts after every lowercase letter, used to end a prefix range
+PREFIX_END = '\x7f'
+
+
+class Vocabulary(tuple):
+    """ An immutable word list that indexes its words on creation
+
+    Behaves exactly like the tuple of its words (indexing, slicing, len,
+    random.choice), but membership and index are dictionary lookups rather
+    than linear scans. Prefix queries use the words in sorted order, where
+    every node of a prefix trie is a contiguous range, so the trie needs no
+    storage beyond one sorted copy of the word list.
+    """
+
+    def __new__(cls, words=()) -> 'Vocabulary':
+        """ Creates a vocabulary of words, keeping their order
+
+        Parameters:
+        words (Iterable[str]): the words in the vocabulary
+        """
+        vocabulary = super().__new__(cls, words)
+        vocabulary._ids = {}
+        # Reversed so a repeated word keeps the id of its first occurrence
+        for word_id in range(len(vocabulary) - 1, -1, -1):
+            vocabulary._ids[vocabulary[word_id]] = word_id
+        vocabulary._sorted = None
+        return vocabulary
+
+    def __contains__(self, word: object) -> bool:
+        """ Returns whether word is in the vocabulary, in O(1) """
+        try:
+            return word in self._ids
+        except TypeError:
+            # Unhashable values can't be words
+            return False
+
+    def index(self, word: str, *args) -> int:
+        """ Returns the id (position) of word, as tuple.index does
+
+        Parameters:
+        word (str): a word in the vocabulary
+
+        Returns:
+        int: position of the first occurrence of word
+        """
+        if args:
+            # Searching a sub-range is rare, so the tuple scan is fine
+            return super().index(word, *args)
+        try:
+            return self._ids[word]
+        except (KeyError, TypeError):
+            raise ValueError(f'{word!r} is not in vocabulary') from None
+
+    def word_id(self, word: str) -> int:
+        """ Returns the id of word, raising KeyError if it isn't known """
+        return self._ids[word]
+
+    def get_word(self, word_id: int) -> str:
+        """ Returns the word with the given id """
+        return self[word_id]
+
+    def complete(self, prefix: str, limit: int = 10) -> tuple[str, ...]:
+        """ Returns words starting with prefix, in alphabetical order
+
+        Parameters:
+        prefix (str): start of the words to find
+        limit (int): most words to return
+
+        Returns:
+        tuple[str, ...]: up to limit words starting with prefix
+        """
+        start, end = self._prefix_range(prefix)
+        return self._sorted_words()[start:min(end, start + limit)]
+
+    def count_prefix(self, prefix: str) -> int:
+        """ Returns the number of words starting with prefix """
+        start, end = self._prefix_range(prefix)
+        return end - start
+
+    def suggest(self, word: str, limit: int = 3) -> tuple[str, ...]:
+        """ Returns known words sharing the longest possible prefix with word
+
+        Used for "did you mean" messages on unknown guesses.
+
+        Parameters:
+        word (str): an unknown word
+        limit (int): most suggestions to return
+
+        Returns:
+        tuple[str, ...]: suggestions, empty if nothing shares a prefix of at
+                         least MIN_SUGGESTION_PREFIX letters
+        """
+        for length in range(len(word), MIN_SUGGESTION_PREFIX - 1, -1):
+            suggestions = self.complete(word[:length], limit)
+            if suggestions:
+                return suggestions
+        return ()
+
+    def _sorted_words(self) -> tuple[str, ...]:
+        """ Returns the words in sorted order, sorting them on first use """
+        if self._sorted is None:
+            words = tuple(self)
+            # Word lists are usually stored sorted, so avoid a copy if so
+            if any(words[i] > words[i + 1] for i in range(len(words) - 1)):
+                words = tuple(sorted(set(words)))
+            self._sorted = words
+        return self._sorted
+
+    def _prefix_range(self, prefix: str) -> tuple[int, int]:
+        """ Returns the [start, end) range of sorted words with prefix """
+        words = self._sorted_words()
+        start = bisect_left(words, prefix)
+        end = bisect_left(words, prefix + PREFIX_END, start)
+        return start, end
@@ -0,0 +1,289 @@
+"""
+Compiled word lists
+Stores a word list file as fixed-width packed records behind a header that
+identifies the source file, so startup can memory-map the words instead of
+parsing the text file.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+
+
+CACHE_DIR = '.wordle_cache'
+COMPILED_SUFFIX = '.wlc'
+MAGIC = b'WLC1'
+# magic, record width, shortest word, word count, source mtime (ns),
+# source size, sha1 of the source contents
+HEADER = struct.Struct('<4sHHIqq20s')
+PADDING = b'\0'
+# Every record ends in a newline so the records can be split in one C call
+TERMINATOR = b'\n'
+
+
+def file_digest(filename: str) -> bytes:
+    """ Returns the sha1 digest of the contents of a file
+
+    Parameters:
+    filename (str): path of the file to hash
+
+    Returns:
+    bytes: the 20 byte sha1 digest
+    """
+    digest = hashlib.sha1()
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def compiled_path(filename: str) -> str:
+    """ Returns where the compiled form of a word list file is stored
+
+    Parameters:
+    filename (str): path of the word list text file
+
+    Returns:
+    str: path of the compiled file, in CACHE_DIR next to the text file
+    """
+    directory, name = os.path.split(filename)
+    return os.path.join(directory, CACHE_DIR, name + COMPILED_SUFFIX)
+
+
+class CompiledWriter:
+    """ Writes a compiled word list of fixed width records in batches
+
+    Records are streamed to a temporary file and the header is written
+    once the word count is known, so the words never need to be held in
+    memory. The file is renamed into place by finish, so readers never see
+    a partially written file.
+    """
+
+    def __init__(self, path: str, width: int) -> None:
+        """ Starts writing a compiled word list
+
+        Parameters:
+        path (str): path of the compiled file
+        width (int): length of the longest word that will be written
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._path = path
+        self._temp_path = f'{path}.{os.getpid()}.tmp'
+        self._width = width
+        self._shortest = width
+        self._count = 0
+        self._file = open(self._temp_path, 'wb')
+        self._file.seek(HEADER.size)
+
+    def write(self, words: list[bytes]) -> None:
+        """ Appends a batch of ASCII encoded words
+
+        Parameters:
+        words (list[bytes]): words no longer than the writer's width
+        """
+        if not words:
+            return
+        width = self._width
+        self._shortest = min(self._shortest, *map(len, words))
+        if self._shortest == width:
+            self._file.write(TERMINATOR.join(words) + TERMINATOR)
+        else:
+            self._file.write(b''.join(
+                word.ljust(width, PADDING) + TERMINATOR for word in words
+            ))
+        self._count += len(words)
+
+    def get_count(self) -> int:
+        """ Returns the number of words written so far """
+        return self._count
+
+    def finish(
+            self, source_mtime: int = 0, source_size: int = 0,
+            digest: bytes = bytes(20)) -> None:
+        """ Writes the header and moves the file into place
+
+        Parameters:
+        source_mtime (int): modification time (ns) of the source file
+        source_size (int): size in bytes of the source file
+        digest (bytes): sha1 digest of the source file
+        """
+        shortest = self._shortest if self._count else 0
+        self._file.seek(0)
+        self._file.write(HEADER.pack(
+            MAGIC, self._width, shortest, self._count, source_mtime,
+            source_size, digest
+        ))
+        self._file.close()
+        os.replace(self._temp_path, self._path)
+
+    def abort(self) -> None:
+        """ Stops writing and removes the temporary file """
+        self._file.close()
+        os.remove(self._temp_path)
+
+
+def pack_words(
+        words: tuple[str, ...], path: str, source_mtime: int = 0,
+        source_size: int = 0, digest: bytes = bytes(20)) -> None:
+    """ Writes words to path as a compiled word list
+
+    Parameters:
+    words (tuple[str, ...]): words to store, all lowercase ASCII
+    path (str): path of the compiled file
+    source_mtime (int): modification time (ns) of the source file
+    source_size (int): size in bytes of the source file
+    digest (bytes): sha1 digest of the source file
+    """
+    width = max((len(word) for word in words), default=0)
+    writer = CompiledWriter(path, width)
+    writer.write([word.encode('ascii') for word in words])
+    writer.finish(source_mtime, source_size, digest)
+
+
+def unpack_words(path: str) -> tuple[tuple[str, ...], tuple]:
+    """ Reads the words stored in a compiled word list
+
+    Parameters:
+    path (str): path of the compiled file
+
+    Returns:
+    tuple[tuple[str, ...], tuple]: the words and the unpacked header
+
+    Raises:
+    ValueError: if path is not a compiled word list
+    """
+    with open(path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if len(data) < HEADER.size:
+                raise ValueError(f'{path} is not a compiled word list')
+            header = HEADER.unpack_from(data)
+            magic, width, shortest, count = header[:4]
+            if (magic != MAGIC
+                    or len(data) != HEADER.size + (width + 1) * count):
+                raise ValueError(f'{path} is not a compiled word list')
+            text = data[HEADER.size:].decode('ascii')
+    # The final terminator leaves an empty string after the last record
+    words = text.split(TERMINATOR.decode())[:-1]
+    if shortest != width:
+        # Only lists of mixed length words have padding to strip
+        words = [word.rstrip(PADDING.decode()) for word in words]
+    return tuple(words), header
+
+
+def read_text_words(filename: str) -> tuple[str, ...]:
+    """ Reads a word list text file with one word per line
+
+    Parameters:
+    filename (str): path of the word list text file
+
+    Returns:
+    tuple[str, ...]: the words in the file, in order
+    """
+    with open(filename, 'r') as file:
+        return tuple(line.strip() for line in file)
+
+
+def load_compiled(filename: str) -> tuple[str, ...]:
+    """ Loads a word list file through its compiled form
+
+    The compiled form is used when the text file's size and modification
+    time match its header. If only the modification time differs the
+    contents are hashed and compared, so touching a file doesn't force a
+    rebuild. Otherwise the compiled form is rebuilt from the text file.
+    If the cache can't be written the text file is read directly.
+
+    Parameters:
+    filename (str): path of the word list text file
+
+    Returns:
+    tuple[str, ...]: the words in the file, in order
+    """
+    path = compiled_path(filename)
+    source = os.stat(filename)
+    digest = None
+    try:
+        words, header = unpack_words(path)
+        mtime, size, cached_digest = header[4:]
+        if mtime == source.st_mtime_ns and size == source.st_size:
+            return words
+        digest = file_digest(filename)
+        if digest == cached_digest:
+            # Contents unchanged, record the new mtime to skip hashing next time
+            pack_words(words, path, source.st_mtime_ns, source.st_size, digest)
+            return words
+    except (OSError, ValueError):
+        # Missing or corrupt compiled file, rebuild it below
+        pass
+
+    words = read_text_words(filename)
+    try:
+        pack_words(
+            words, path, source.st_mtime_ns, source.st_size,
+            digest or file_digest(filename)
+        )
+    except OSError:
+        # A read-only directory only costs the faster startup
+        pass
+    return words
+
+
+def shard_path(filename: str, length: int) -> str:
+    """ Returns where the words of one length from a word list are stored
+
+    Parameters:
+    filename (str): path of the word list text file
+    length (int): length of the words in the shard
+
+    Returns:
+    str: path of the compiled shard, in CACHE_DIR next to the text file
+    """
+    directory, name = os.path.split(filename)
+    return os.path.join(
+        directory, CACHE_DIR, f'{name}.{length}{COMPILED_SUFFIX}'
+    )
+
+
+def load_shard(filename: str, length: int) -> tuple[str, ...]:
+    """ Loads the words of one length from a word list file
+
+    Each length is stored as its own compiled file, so loading the words of
+    one length never reads the others. When the shard is missing or older
+    than the text file, the whole list is loaded once through its compiled
+    form and the shard of every length in it is rewritten from it. Lengths
+    with no words get no shard.
+
+    Parameters:
+    filename (str): path of the word list text file
+    length (int): length of the words to load
+
+    Returns:
+    tuple[str, ...]: the words of that length, in file order
+    """
+    path = shard_path(filename, length)
+    source = os.stat(filename)
+    try:
+        words, header = unpack_words(path)
+        mtime, size = header[4:6]
+        if mtime == source.st_mtime_ns and size == source.st_size:
+            return words
+    except (OSError, ValueError):
+        # Missing or corrupt shard, rebuild the shards below
+        pass
+
+    shards = {length: []}
+    for word in load_compiled(filename):
+        shards.setdefault(len(word), []).append(word)
+    digest = file_digest(filename)
+    try:
+        for shard_length, words in shards.items():
+            if not words:
+                continue
+            pack_words(
+                tuple(words), shard_path(filename, shard_length),
+                source.st_mtime_ns, source.st_size, digest
+            )
+    except OSError:
+        # A read-only directory only costs the faster startup
+        pass
+    return tuple(shards[length])
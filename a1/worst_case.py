@@ -0,0 +1,316 @@
+"""
+Worst-case Wordle solver
+Finds guesses that minimise the most guesses any answer can take, with a
+depth-limited minimax search over candidate sets. Each node tries the
+guesses with the smallest largest partition first, so good bounds are found
+early and the rest can be cut off from their partition sizes alone.
+
+Run from the a1 directory: python worst_case.py [workers] [branching]
+"""
+
+import hashlib
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from a1_support import load_words, VOCAB_FILE, ANSWERS_FILE
+from feedback import FeedbackMatrix
+from patterns import winning_code
+from session import MAX_GUESSES
+from sharedmem import attach_feedback, publish_feedback
+from solver import Solver, MINIMAX
+
+
+# Guesses tried at each node, best by largest partition first
+BRANCHING = 12
+
+# Search used by the root guesses evaluated in this worker process
+_worker_search = None
+
+
+def candidate_key(candidates: np.ndarray) -> bytes:
+    """ Returns a canonical hash of a set of candidate answers
+
+    Parameters:
+    candidates (np.ndarray): answer indices, in increasing order
+
+    Returns:
+    bytes: a digest that only depends on which candidates are in the set
+    """
+    indices = np.asarray(candidates, dtype=np.int32)
+    return hashlib.blake2b(indices.tobytes(), digest_size=16).digest()
+
+
+class WorstCaseSearch:
+    """ Depth-limited minimax over sets of candidate answers
+
+    The value of a candidate set is the fewest guesses that solve every
+    candidate in the worst case, counting the final guess. Results are
+    kept in a transposition cache keyed by the candidate set, as exact
+    values when solved and as lower bounds when the limit was reached.
+    """
+
+    def __init__(
+            self, vocab: tuple[str, ...], answers: tuple[str, ...],
+            branching: int = BRANCHING,
+            matrix: Optional[FeedbackMatrix] = None) -> None:
+        """ Creates a search over vocab and answers
+
+        Parameters:
+        vocab (tuple[str, ...]): words that can be guessed
+        answers (tuple[str, ...]): words that can be the answer
+        branching (int): guesses tried at each node
+        matrix (FeedbackMatrix): matrix of vocab against answers, loaded
+                                 from the cache if not given
+        """
+        self._solver = Solver(vocab, answers, MINIMAX, matrix)
+        self._patterns = self._solver.get_patterns()
+        self._answer_rows = np.array([
+            self._solver.get_matrix().guess_index(answer)
+            for answer in self._solver.get_matrix().get_answers()
+        ])
+        self._win = winning_code(len(answers[0]))
+        self._branching = branching
+        # candidate key -> (lower bound, exact value or None, best guess)
+        self._cache = {}
+        self._nodes = 0
+        self._lookups = 0
+        self._hits = 0
+
+    def get_solver(self) -> Solver:
+        """ Returns the solver used to order guesses """
+        return self._solver
+
+    def get_stats(self) -> dict:
+        """ Returns the nodes searched, cache lookups and cache hits """
+        return {
+            'nodes': self._nodes,
+            'lookups': self._lookups,
+            'hits': self._hits,
+        }
+
+    def guesses(self, candidates: np.ndarray) -> list[int]:
+        """ Returns the guesses tried for candidates, most promising first
+
+        Parameters:
+        candidates (np.ndarray): answer indices of the candidates
+
+        Returns:
+        list[int]: vocab indices of the guesses
+        """
+        guesses = self._solver.rank_candidates(candidates, self._branching)
+        if len(candidates) <= self._branching:
+            # Candidates can win outright, which splitters can't
+            guesses += [int(self._answer_rows[i]) for i in candidates]
+        return list(dict.fromkeys(guesses))
+
+    def split(self, guess: int, candidates: np.ndarray) -> list[np.ndarray]:
+        """ Returns the candidates left for each non-winning pattern
+
+        Parameters:
+        guess (int): vocab index of the guess
+        candidates (np.ndarray): answer indices of the candidates
+
+        Returns:
+        list[np.ndarray]: the partitions, largest first
+        """
+        codes = self._patterns[guess, candidates]
+        order = np.argsort(codes, kind='stable')
+        ordered = codes[order]
+        starts = np.flatnonzero(np.diff(ordered, prepend=-1))
+        parts = [
+            candidates[np.sort(indices)]
+            for indices, code in zip(np.split(order, starts[1:]),
+                                     ordered[starts])
+            if code != self._win
+        ]
+        parts.sort(key=len, reverse=True)
+        return parts
+
+    def value(self, candidates: np.ndarray, limit: int = MAX_GUESSES) -> int:
+        """ Returns the worst-case guesses needed to solve candidates
+
+        Parameters:
+        candidates (np.ndarray): answer indices of the candidates
+        limit (int): most guesses allowed
+
+        Returns:
+        int: the value, or a number above limit if it can't be reached
+        """
+        return self.solve(candidates, limit)[0]
+
+    def solve(
+            self, candidates: np.ndarray,
+            limit: int = MAX_GUESSES) -> tuple[int, Optional[int]]:
+        """ Returns the value of candidates and a guess that achieves it
+
+        Parameters:
+        candidates (np.ndarray): answer indices of the candidates
+        limit (int): most guesses allowed
+
+        Returns:
+        tuple[int, Optional[int]]: the value and the vocab index of the
+            guess, or a value above limit and None if limit can't be met
+        """
+        self._nodes += 1
+        size = len(candidates)
+        if size == 1:
+            return 1, int(self._answer_rows[candidates[0]])
+        if limit < 2:
+            # One guess can't separate two or more candidates
+            return limit + 1, None
+        if size == 2:
+            return 2, int(self._answer_rows[candidates[0]])
+
+        key = candidate_key(candidates)
+        self._lookups += 1
+        if key in self._cache:
+            lower, exact, guess = self._cache[key]
+            if exact is not None:
+                self._hits += 1
+                return exact, guess
+            if lower > limit:
+                self._hits += 1
+                return lower, None
+
+        best, best_guess = limit + 1, None
+        for guess in self.guesses(candidates):
+            # Only a guess beating best is worth searching
+            bound = best - 1
+            worst = self.guess_value(guess, candidates, bound)
+            if worst <= bound:
+                best, best_guess = worst, guess
+                if best <= 2:
+                    # Nothing can do better with more than two candidates
+                    break
+        if best_guess is None:
+            self._cache[key] = limit + 1, None, None
+        else:
+            self._cache[key] = best, best, best_guess
+        return best, best_guess
+
+    def guess_value(
+            self, guess: int, candidates: np.ndarray, bound: int) -> int:
+        """ Returns the worst-case guesses if guess is played first
+
+        Stops as soon as the value is known to be above bound. Partitions
+        are searched largest first, as they are the most likely to go over.
+
+        Parameters:
+        guess (int): vocab index of the first guess
+        candidates (np.ndarray): answer indices of the candidates
+        bound (int): largest value worth finding exactly
+
+        Returns:
+        int: the value, or a number above bound
+        """
+        parts = self.split(guess, candidates)
+        if not parts:
+            return 1
+        if len(parts[0]) == len(candidates):
+            # The guess tells nothing apart
+            return bound + 1
+        # A partition of two or more needs at least two more guesses
+        if 1 + (2 if len(parts[0]) > 1 else 1) > bound:
+            return bound + 1
+        worst = 2
+        for part in parts:
+            value = 1 + self.value(part, bound - 1)
+            if value > bound:
+                return value
+            worst = max(worst, value)
+        return worst
+
+
+def _init_worker(specs: dict, branching: int) -> None:
+    """ Creates the search used by a worker process """
+    global _worker_search
+    matrix = attach_feedback(specs)
+    _worker_search = WorstCaseSearch(
+        matrix.get_guesses(), matrix.get_answers(), branching, matrix
+    )
+
+
+def _root_value(
+        guess: int, candidates: np.ndarray,
+        limit: int) -> tuple[int, dict]:
+    """ Evaluates one root guess in a worker process
+
+    Returns:
+    tuple[int, dict]: the value of the guess and the search stats it added
+    """
+    before = _worker_search.get_stats()
+    value = _worker_search.guess_value(guess, candidates, limit)
+    after = _worker_search.get_stats()
+    return value, {name: after[name] - before[name] for name in after}
+
+
+def search(
+        vocab: tuple[str, ...], answers: tuple[str, ...],
+        limit: int = MAX_GUESSES, workers: Optional[int] = None,
+        branching: int = BRANCHING) -> tuple[int, Optional[str], dict]:
+    """ Finds the root guess with the best worst case over every answer
+
+    Root guesses are evaluated in parallel by a process pool sharing one
+    copy of the feedback matrix. Each worker keeps its own cache.
+
+    Parameters:
+    vocab (tuple[str, ...]): words that can be guessed
+    answers (tuple[str, ...]): words that can be the answer
+    limit (int): most guesses allowed
+    workers (int): number of worker processes, defaults to the CPU count
+    branching (int): guesses tried at each node
+
+    Returns:
+    tuple[int, Optional[str], dict]: the worst-case number of guesses, the
+        root guess (None if limit can't be met) and a report with the
+        nodes searched, cache lookups, hits, hit rate and seconds taken
+    """
+    start = time.perf_counter()
+    root_search = WorstCaseSearch(vocab, answers, branching)
+    candidates = np.arange(len(answers))
+    roots = root_search.guesses(candidates)
+    matrix = root_search.get_solver().get_matrix()
+    with publish_feedback(matrix) as shared, ProcessPoolExecutor(
+            workers, initializer=_init_worker,
+            initargs=(shared.get_specs(), branching)) as executor:
+        results = list(executor.map(
+            _root_value, roots, [candidates] * len(roots),
+            [limit] * len(roots)
+        ))
+
+    best, best_guess = limit + 1, None
+    report = {'nodes': 1, 'lookups': 0, 'hits': 0}
+    for root, (value, stats) in zip(roots, results):
+        if value < best:
+            best, best_guess = value, matrix.get_guesses()[root]
+        for name in report:
+            report[name] += stats[name]
+    report['hit_rate'] = report['hits'] / max(report['lookups'], 1)
+    report['seconds'] = time.perf_counter() - start
+    return best, best_guess, report
+
+
+def main():
+    """ Searches vocab.txt and answers.txt and prints the result """
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    branching = int(sys.argv[2]) if len(sys.argv) > 2 else BRANCHING
+    value, guess, report = search(
+        load_words(VOCAB_FILE), load_words(ANSWERS_FILE),
+        workers=workers, branching=branching
+    )
+    if guess is None:
+        print(f'No strategy solves every answer in {MAX_GUESSES} guesses')
+    else:
+        print(f'Every answer solved in at most {value} guesses, '
+              f'starting with {guess}')
+    print(f"{report['nodes']} nodes searched in {report['seconds']:.2f}s, "
+          f"cache hit rate {report['hit_rate']:.1%} "
+          f"({report['hits']} of {report['lookups']} lookups)")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,28 @@ TILE_TYPES = {
     DOOR: 'Door()'
 }
 
+# Ids of the tiles stored in an ArrayMaze, one byte per tile
+EMPTY_TILE = 0
+WALL_TILE = 1
+LAVA_TILE = 2
+DOOR_TILE = 3
+OPEN_DOOR_TILE = 4
+# Properties of each tile id, indexed by the id
+TILE_BLOCKING = (False, True, False, True, False)
+TILE_DAMAGE = (0, 0, LAVA_DAMAGE, 0, 0)
+# Translation from the characters of a maze row to tile ids. Entities stand
+# on empty tiles, like in Maze.add_row
+ROW_TO_TILES = bytes(
+    {WALL: WALL_TILE, LAVA: LAVA_TILE, DOOR: DOOR_TILE}.get(chr(char),
+                                                            EMPTY_TILE)
+    for char in range(256)
+)
+# Translation from tile ids back to tile IDs, unlocked doors show as empty
+TILES_TO_ROW = bytes(
+    ord((EMPTY, WALL, LAVA, DOOR, EMPTY)[tile]) if tile <= OPEN_DOOR_TILE
+    else 0 for tile in range(256)
+)
+
 ENTITIES_LIST = {
     COIN: 'Coin(({}))',
     POTION: 'Potion(({}))',
@@ -44,11 +66,15 @@ WRONG_ITEM_NAME = '\nNo item with that name!\n'
 MAZE_STRING = 'Maze: {}\nItems: {}\nPlayer start: {}'
 
 
-def load_game(filename: str) -> list['Level']:
+def load_game(
+        filename: str,
+        maze_type: Optional[type['Maze']] = None) -> list['Level']:
     """ Reads a game file and creates a list of all the levels in order.
 
     Parameters:
         filename: The path to the game file
+        maze_type: Maze class that stores the tiles of each level, Maze by
+            default
 
     Returns:
         A list of all Level instances to play in the game
@@ -60,7 +86,7 @@ def load_game(filename: str) -> list['Level']:
             if line.startswith('Maze'):
                 _, _, dimensions = line[5:].partition(' - ')
                 dimensions = [int(item) for item in dimensions.split()]
-                levels.append(Level(dimensions))
+                levels.append(Level(dimensions, maze_type or Maze))
             elif len(line) > 0 and len(levels) > 0:
                 levels[-1].add_row(line)
     return levels
@@ -492,6 +518,22 @@ class Maze:
         """
         return self._layout[position[0]][position[1]]
 
+    def is_blocking(self, position: tuple[int, int]) -> bool:
+        """Returns true if the tile at a given position is blocking
+
+        Parameters:
+            position: tuple with x and y coordinates
+        """
+        return self.get_tile(position).is_blocking()
+
+    def damage(self, position: tuple[int, int]) -> int:
+        """Returns the damage done by stepping on a given position
+
+        Parameters:
+            position: tuple with x and y coordinates
+        """
+        return self.get_tile(position).damage()
+
     def __str__(self) -> str:
         """Returns the string representation of the maze. Each line in the
         output is a row in the maze which is a line of Tile IDs"""
@@ -516,19 +558,177 @@ class Maze:
         return f"{self.get_name()}({str(self._dimensions)})"
 
 
+class ArrayMaze(Maze):
+    """A maze that stores a byte per tile instead of a Tile instance
+
+    Stateless tiles are shared (flyweight) instances, while each door gets
+    its own instance as it can be unlocked. Moves read whether a tile is
+    blocking and its damage from tables indexed by the tile's byte, so no
+    Tile is looked up at all.
+
+    Rows are kept at the length they were added with, like in Maze, so a
+    position past the end of a short row raises IndexError (which the game
+    treats as leaving the maze). Each row takes as many bytes as the widest
+    row, which is the number of columns unless a row is longer.
+    """
+    _FLYWEIGHTS = (Empty(), Wall(), Lava())
+
+    def __init__(self, dimensions: tuple[int, int]) -> None:
+        """Creates an empty maze instance based on row and column dimensions
+
+        Parameters:
+            dimensions: tuple with number of rows and columns in the maze
+        """
+        super().__init__(dimensions)
+        self._grid = bytearray(dimensions[0] * dimensions[1])
+        self._rows = 0
+        # Bytes per row in the grid
+        self._columns = dimensions[1]
+        # Number of tiles in each row
+        self._lengths = []
+        # Position of each door, in the order they were added
+        self._doors = {}
+
+    def add_row(self, row: str) -> None:
+        """Adds a row of tiles to the maze, given a string of Tile IDs
+
+        Parameters:
+            row: string containing a row of Tile IDs, of any length
+        """
+        # Characters outside latin-1 are empty tiles, like any unknown ID
+        tiles = row.encode('latin-1', 'replace').translate(ROW_TO_TILES)
+        if len(tiles) > self._columns:
+            self._widen(len(tiles))
+        columns = self._columns
+        start = self._rows * columns
+        self._grid[start:start + columns] = tiles.ljust(
+            columns, bytes((EMPTY_TILE,))
+        )
+        column = tiles.find(DOOR_TILE)
+        while column != -1:
+            self._doors[(self._rows, column)] = Door()
+            column = tiles.find(DOOR_TILE, column + 1)
+        self._lengths.append(len(tiles))
+        self._rows += 1
+
+    def _widen(self, columns: int) -> None:
+        """Copies the grid so that each row takes a given number of bytes
+
+        Parameters:
+            columns: the new number of bytes per row
+        """
+        old = self._columns
+        grid = bytearray(max(self._dimensions[0], self._rows) * columns)
+        for row in range(self._rows):
+            start = row * columns
+            grid[start:start + old] = self._grid[row * old:(row + 1) * old]
+        self._grid = grid
+        self._columns = columns
+
+    def _index(self, position: tuple[int, int]) -> int:
+        """Returns the index of a position in the grid, wrapping negative
+        rows and columns around like list indexes
+
+        Parameters:
+            position: tuple with x and y coordinates
+
+        Raises:
+            IndexError: if the position is outside the maze or past the end
+                of its row
+        """
+        row, column = position
+        if 0 <= row < self._rows and 0 <= column < self._lengths[row]:
+            return row * self._columns + column
+        if not -self._rows <= row < self._rows:
+            raise IndexError('maze position out of range')
+        row %= self._rows
+        length = self._lengths[row]
+        if not -length <= column < length:
+            raise IndexError('maze position out of range')
+        return row * self._columns + column % length
+
+    def get_tiles(self) -> list[list[Tile]]:
+        """Returns the layout of the maze, as a new list of rows of tiles"""
+        columns = self._columns
+        tiles = []
+        for row, length in enumerate(self._lengths):
+            start = row * columns
+            tiles.append([
+                self._FLYWEIGHTS[tile] if tile < DOOR_TILE else None
+                for tile in self._grid[start:start + length]
+            ])
+        for (row, column), door in self._doors.items():
+            tiles[row][column] = door
+        return tiles
+
+    def get_layout(self) -> list[list[Tile]]:
+        """Returns the layout of the maze"""
+        return self.get_tiles()
+
+    def unlock_door(self) -> None:
+        """Unlocks the door in the maze"""
+        for position, door in self._doors.items():
+            if door.get_id() == DOOR:
+                door.unlock()
+                self._grid[self._index(position)] = OPEN_DOOR_TILE
+                return None
+
+    def get_tile(self, position: tuple[int, int]) -> Tile:
+        """Returns the tile instance in the maze at a given position
+
+        Parameters:
+            position: tuple with x and y coordinates
+        """
+        index = self._index(position)
+        tile = self._grid[index]
+        if tile < DOOR_TILE:
+            return self._FLYWEIGHTS[tile]
+        return self._doors[divmod(index, self._columns)]
+
+    def is_blocking(self, position: tuple[int, int]) -> bool:
+        """Returns true if the tile at a given position is blocking
+
+        Parameters:
+            position: tuple with x and y coordinates
+        """
+        return TILE_BLOCKING[self._grid[self._index(position)]]
+
+    def damage(self, position: tuple[int, int]) -> int:
+        """Returns the damage done by stepping on a given position
+
+        Parameters:
+            position: tuple with x and y coordinates
+        """
+        return TILE_DAMAGE[self._grid[self._index(position)]]
+
+    def __str__(self) -> str:
+        """Returns the string representation of the maze. Each line in the
+        output is a row in the maze which is a line of Tile IDs"""
+        columns = self._columns
+        text = self._grid[:self._rows * columns].translate(TILES_TO_ROW)
+        return '\n'.join(
+            text[row * columns:row * columns + length].decode('ascii')
+            for row, length in enumerate(self._lengths)
+        )
+
+
 class Level:
     """An object that keeps track of the maze and entities in a level"""
 
-    def __init__(self, dimensions: tuple[int, int]) -> None:
+    def __init__(
+            self, dimensions: tuple[int, int],
+            maze_type: type[Maze] = Maze) -> None:
         """Creates a level with an empty maze instance based on row and column
          dimensions, along with no player or items
 
          Parameters:
             dimensions: tuple with number of rows and columns in the maze
+            maze_type: Maze class that stores the level's tiles
          """
-        self._maze = Maze(dimensions)
+        self._maze = maze_type(dimensions)
         self._entities = {}
         self._player_position = None
+        self._rows = 0
 
     def get_maze(self) -> Maze:
         """Returns the level's maze instance"""
@@ -552,7 +752,8 @@ class Level:
             row: A row of Tile and Entity IDs to place in the level's row
         """
         self.get_maze().add_row(row)
-        row_num = len(self.get_maze().get_layout()) - 1
+        row_num = self._rows
+        self._rows += 1
         # Uses pos and row_num to calculate position
         for pos, item in enumerate(row):
             if item in ENTITIES_LIST:
@@ -627,14 +828,18 @@ class Level:
 class Model:
     """Class that is used by the controller to modify the game state. This
     class keeps track of the player and the level instances"""
-    def __init__(self, game_file: str) -> None:
+    def __init__(
+            self, game_file: str,
+            maze_type: Optional[type[Maze]] = None) -> None:
         """Creates a model instance from the given game_file
 
         Parameters:
             game_file: path to a file containing game information
+            maze_type: Maze class that stores the tiles of each level, Maze
+                by default
         """
         self._game_file = game_file
-        self._levels = load_game(self._game_file)
+        self._levels = load_game(self._game_file, maze_type)
         self._level_num = 0
         self._player = Player(self.get_level().get_player_start())
 
@@ -673,36 +878,24 @@ class Model:
         """Returns true if the player leveled up from the last turn"""
         return self._level_up_move == self._move_counter
 
-    def _update_stats(self, tile: Tile) -> None:
-        """Updates the player's stats, given the tile they land on
+    def _update_stats(self, damage: int) -> None:
+        """Updates the player's stats, given the damage of the tile they land
+        on
 
         Parameters:
-            tile: instance of Tile
+            damage: damage done by the tile
         """
         # Gain 1 thirst and hunger after every 5 moves
         if not (self._move_counter - 1) % 5:
             self.get_player().change_hunger(HUNGER_DECREASE)
             self.get_player().change_thirst(THIRST_DECREASE)
 
-        self.get_player().change_health(HEALTH_DECREASE - tile.damage())
+        self.get_player().change_health(HEALTH_DECREASE - damage)
 
     def get_name(self) -> str:
         """Returns the name of the class"""
         return type(self).__name__
 
-    def _out_of_maze(self, position: tuple[int, int]) -> bool:
-        """Returns true if the given position is outside the maze dimensions
-
-        Parameters:
-            position: tuple containing x and y coordinates
-        """
-        try:
-            self.get_current_maze().get_tile(position)
-            return False
-        except IndexError:
-            self.level_up()
-            return True
-
     def move_player(self, delta: tuple[int, int]) -> None:
         """Moves the player by a certain amount (delta)
 
@@ -712,16 +905,19 @@ class Model:
         player_pos = self.get_player_position()
         position = (delta[0]+player_pos[0], delta[1]+player_pos[1])
 
-        # Checks if player has finished the level
-        if self._out_of_maze(position):
+        maze = self.get_current_maze()
+        try:
+            blocking = maze.is_blocking(position)
+        except IndexError:
+            # Player has left the maze, finishing the level
+            self.level_up()
             return None
 
-        tile = self.get_current_maze().get_tile(position)
-        if not tile.is_blocking():
+        if not blocking:
             self.attempt_collect_item(position)
             self.get_player().set_position(position)
             self._move_counter += 1
-            self._update_stats(tile)
+            self._update_stats(maze.damage(position))
         return None
 
     def attempt_collect_item(self, position: tuple[int, int]) -> None:
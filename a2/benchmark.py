@@ -0,0 +1,149 @@
+"""
+MazeRunner benchmarks
+Compares the memory and speed of Maze, which creates a Tile instance per
+tile, against ArrayMaze, which stores a byte per tile, on a large randomly
+generated maze.
+
+Run from the a2 directory: python benchmark.py [size] [moves]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from a2 import ArrayMaze, Maze, Model, load_game
+from constants import COIN, DOOR, EMPTY, LAVA, MOVE_DELTAS, PLAYER, WALL
+
+
+SEED = 1001
+SIZE = 2000
+MOVES = 100000
+LOOKUPS = 1000000
+# Share of the inside of the maze covered by each kind of tile
+WALL_SHARE = 0.2
+LAVA_SHARE = 0.05
+
+
+def generate_game(size: int, seed: int = SEED) -> str:
+    """ Returns a game file with one square level of random tiles
+
+    The level has a wall around it, a door in the bottom wall, the player
+    in the middle and a coin in the top left corner, so the door stays
+    locked and moves never have to search the maze for it.
+
+    Parameters:
+        size: number of rows and columns of the maze
+        seed: seed of the random tiles
+
+    Returns:
+        The contents of the game file
+    """
+    generator = random.Random(seed)
+    rows = [WALL * size]
+    for _ in range(size - 2):
+        inside = generator.choices(
+            (WALL, LAVA, EMPTY),
+            (WALL_SHARE, LAVA_SHARE, 1 - WALL_SHARE - LAVA_SHARE),
+            k=size - 2
+        )
+        rows.append(WALL + ''.join(inside) + WALL)
+    rows.append(WALL * (size // 2) + DOOR + WALL * (size - size // 2 - 1))
+    middle = size // 2
+    rows[1] = WALL + COIN + rows[1][2:]
+    rows[middle] = (rows[middle][:middle] + PLAYER
+                    + rows[middle][middle + 1:])
+    return f'Maze 1 - {size} {size}\n' + '\n'.join(rows) + '\n'
+
+
+def measure_loading(path: str, maze_type: type) -> tuple[float, int]:
+    """ Loads a game file and measures the time and memory it takes
+
+    Parameters:
+        path: the game file
+        maze_type: Maze class that stores the tiles
+
+    Returns:
+        Seconds taken and bytes still allocated once loaded
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    levels = load_game(path, maze_type)
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del levels
+    return elapsed, allocated
+
+
+def measure_moves(path: str, maze_type: type, moves: int) -> float:
+    """ Returns how many random moves per second a model makes
+
+    Parameters:
+        path: the game file
+        maze_type: Maze class that stores the tiles
+        moves: number of moves to make
+    """
+    model = Model(path, maze_type)
+    generator = random.Random(SEED)
+    deltas = [generator.choice(tuple(MOVE_DELTAS.values()))
+              for _ in range(moves)]
+    start = time.perf_counter()
+    for delta in deltas:
+        model.move_player(delta)
+    return moves / (time.perf_counter() - start)
+
+
+def measure_lookups(maze: Maze, lookups: int) -> tuple[float, float]:
+    """ Returns tile property lookups per second through tiles and tables
+
+    Parameters:
+        maze: the maze to look tiles up in
+        lookups: number of random positions to look up
+
+    Returns:
+        Lookups per second of get_tile(...).is_blocking() and of
+        is_blocking(...)
+    """
+    rows, columns = maze.get_dimensions()
+    generator = random.Random(SEED)
+    positions = [(generator.randrange(rows), generator.randrange(columns))
+                 for _ in range(lookups)]
+    start = time.perf_counter()
+    for position in positions:
+        maze.get_tile(position).is_blocking()
+    through_tiles = lookups / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for position in positions:
+        maze.is_blocking(position)
+    through_tables = lookups / (time.perf_counter() - start)
+    return through_tiles, through_tables
+
+
+def main():
+    """ Runs the benchmarks on Maze and ArrayMaze """
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    moves = int(sys.argv[2]) if len(sys.argv) > 2 else MOVES
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'game.txt')
+        with open(path, 'w') as file:
+            file.write(generate_game(size))
+        print(f'{size}x{size} maze, {size * size:,} tiles')
+        for maze_type in (Maze, ArrayMaze):
+            name = maze_type.__name__
+            elapsed, allocated = measure_loading(path, maze_type)
+            print(f'{name}: loaded in {elapsed:.2f}s, '
+                  f'{allocated / 1e6:,.1f} MB allocated')
+            rate = measure_moves(path, maze_type, moves)
+            print(f'{name}: {rate:,.0f} moves/s')
+            maze = load_game(path, maze_type)[0].get_maze()
+            through_tiles, through_tables = measure_lookups(maze, LOOKUPS)
+            print(f'{name}: get_tile().is_blocking() {through_tiles:,.0f}'
+                  f'/s, is_blocking() {through_tables:,.0f}/s')
+            del maze
+
+
+if __name__ == "__main__":
+    main()